@@ -1,207 +1,398 @@
 # app/__init__.py - Updated with Loadout, Ballistic, and Training features
 from flask import Flask
+from flask.json.provider import JSONProvider
+from decimal import Decimal
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from flask_mail import Mail
+import importlib
+import logging
 import os
+import threading
+import time
 from sqlalchemy import text
 
+from .config import CONFIGS as _PREPARED_CONFIGS
+
 # Initialize extensions
-db = SQLAlchemy()
+# expire_on_commit=False keeps objects readable after the per-save
+# commits without a refresh SELECT; autoflush is off because every
+# write path here flushes explicitly via commit()
+db = SQLAlchemy(session_options={'expire_on_commit': False, 'autoflush': False})
+
+# Keep SQLAlchemy's engine logger quiet unless echo is explicitly
+# requested via SQLALCHEMY_ECHO=1
+logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
 migrate = Migrate()
 jwt = JWTManager()
 mail = Mail()
 
+# Tables the startup report and /api/db-info care about
+_KNOWN_TABLES = (
+    'users', 'password_reset_tokens',
+    'rifles', 'ammunition', 'scopes', 'maintenance',
+    'dope_entries', 'zero_entries', 'chronograph_data', 'ballistic_calculations',
+    'training_sessions', 'sensor_data', 'device_connections',
+)
+
+# Precompiled SQL sentinels - built once instead of per call
+_PING = text('SELECT 1')
+_counts_sql_cache = {}
+
+# Health-check cache so bursts of liveness probes collapse to one query
+_HEALTH_CHECK_TTL = 2.0
+_health_lock = threading.Lock()
+_health_cache = {'checked_at': 0.0, 'ok': False, 'error': None}
+
+def _check_database_health():
+    """Ping the database through the pooled session, with a short TTL cache.
+
+    Returns (ok, error). Kubernetes-style probes hit /api/health every
+    few seconds; the cache means at most one SELECT 1 per TTL window,
+    and pool_pre_ping already validates the underlying connection.
+    """
+    now = time.monotonic()
+    with _health_lock:
+        if now - _health_cache['checked_at'] < _HEALTH_CHECK_TTL:
+            return _health_cache['ok'], _health_cache['error']
+    try:
+        db.session.execute(_PING)
+        ok, error = True, None
+    except Exception as e:
+        ok, error = False, str(e)
+    with _health_lock:
+        _health_cache.update(checked_at=now, ok=ok, error=error)
+    return ok, error
+
+# Cached catalog of existing table names, refreshed by prepare_database
+_existing_tables = None
+
+def _existing_table_names(refresh=False):
+    """Get the set of tables in the database, memoized at module level"""
+    global _existing_tables
+    if _existing_tables is None or refresh:
+        from sqlalchemy import inspect
+        _existing_tables = set(inspect(db.engine).get_table_names())
+    return _existing_tables
+
+def _get_table_counts():
+    """Get row counts for all known tables in a single query.
+
+    Uses the cached inspector catalog to find which tables exist, then
+    one batched query of scalar subqueries instead of a COUNT
+    round-trip per table. Missing tables are reported with a count of 0.
+    """
+    counted = tuple(name for name in _KNOWN_TABLES if name in _existing_table_names())
+    counts = {name: 0 for name in _KNOWN_TABLES}
+    if counted:
+        stmt = _counts_sql_cache.get(counted)
+        if stmt is None:
+            # Interpolated names must come from the module-level
+            # whitelist - never from request input
+            assert all(name in _KNOWN_TABLES for name in counted)
+            stmt = text('SELECT ' + ', '.join(
+                f'(SELECT COUNT(*) FROM {name}) AS {name}' for name in counted
+            ))
+            _counts_sql_cache[counted] = stmt
+        row = db.session.execute(stmt).mappings().one()
+        counts.update(row)
+    return counts
+
+# orjson writes JSON straight to bytes in C (native datetime support,
+# no per-key Python encoder calls); fall back to Flask's default
+# provider when the wheel isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _orjson_default(obj):
+    """Encoder hook for types orjson doesn't know natively
+
+    Model instances serialize through their own to_dict as orjson
+    walks the response - views can pass entities (or lists of them)
+    straight to jsonify without a Python-level pre-pass that builds
+    and then re-iterates an intermediate list of dicts.
+    """
+    to_dict = getattr(obj, 'to_dict', None)
+    if to_dict is not None:
+        return to_dict()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+class _OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC, default=_orjson_default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 def create_app(config_name=None):
     """Application factory pattern with automatic table creation"""
     app = Flask(__name__)
+    if orjson is not None:
+        app.json = _OrjsonProvider(app)
     
     # Load configuration
     if config_name is None:
         config_name = os.environ.get('FLASK_ENV', 'development')
+
+    app.config.update(_PREPARED_CONFIGS[config_name])
     
-    from .config import config
-    app.config.from_object(config[config_name])
-    
-    # Initialize extensions with app
+    # Initialize extensions with app - optional subsystems are gated by
+    # the config's FEATURES set so testing/thin workers skip them
+    features = app.config.get('FEATURES', frozenset({'migrate', 'jwt', 'mail', 'cors'}))
     db.init_app(app)
-    migrate.init_app(app, db)
-    jwt.init_app(app)
-    mail.init_app(app)
-    CORS(app, origins=app.config['CORS_ORIGINS'])
+    if 'migrate' in features:
+        migrate.init_app(app, db)
+    if 'jwt' in features:
+        jwt.init_app(app)
+    if 'mail' in features:
+        mail.init_app(app)
+    if 'cors' in features:
+        CORS(app, origins=app.config['CORS_ORIGINS'])
     
-    # Import all models here to ensure they are registered with SQLAlchemy
-    from .models.user import User, PasswordResetToken
-    from .models.loadout import Rifle, Ammunition, Scope, Maintenance
-    from .models.ballistic import DopeEntry, ZeroEntry, ChronographData, BallisticCalculation
-    
-    # Create database tables automatically if they don't exist
+    # Table creation/verification is opt-in via `flask init-db` (or
+    # prepare_database) so each Gunicorn worker doesn't repeat the DDL
+    # and COUNT queries on every factory call.
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create database tables and verify connectivity"""
+        prepare_database(app)
+
+    # Register blueprints
+    _register_blueprints(app)
+
+    # System endpoints (module-level view functions shared across
+    # factory calls)
+    app.add_url_rule('/api/health', view_func=health_check)
+    app.add_url_rule('/api/db-info', view_func=database_info)
+    app.add_url_rule('/api/cleanup-expired-tokens', view_func=cleanup_expired_tokens)
+
+    # Unit-of-work commit: model save()/delete() only flush, the
+    # request's writes are committed here in one fsync (or rolled back
+    # if the handler answered with an error status)
+    app.after_request(_commit_on_response)
+
+    return app
+
+# JWT error handlers - registered once on the module-level manager so
+# repeated create_app calls don't allocate fresh closures
+@jwt.expired_token_loader
+def _expired_token_callback(jwt_header, jwt_payload):
+    return {'message': 'Token has expired'}, 401
+
+@jwt.invalid_token_loader
+def _invalid_token_callback(error):
+    return {'message': 'Invalid token'}, 401
+
+@jwt.unauthorized_loader
+def _missing_token_callback(error):
+    return {'message': 'Authorization token is required'}, 401
+
+from contextlib import contextmanager
+
+@contextmanager
+def atomic():
+    """One-transaction scope: commit on success, roll back on error
+
+    Wrap multi-entity writes so they cost a single fsync:
+
+        with atomic():
+            rifle.save(commit=False)
+            scope.save(commit=False)
+    """
+    try:
+        yield db.session
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+def _commit_on_response(response):
+    """Commit the request's flushed writes on success, roll back on error"""
+    try:
+        if response.status_code < 400:
+            db.session.commit()
+        else:
+            db.session.rollback()
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Commit on response failed: {e}")
+        response.status_code = 500
+    return response
+
+def health_check():
+    """Health check endpoint"""
+    # Cached ping over the pooled session instead of a fresh connection
+    # per probe
+    ok, error = _check_database_health()
+    if ok:
+        return {
+            'status': 'healthy',
+            'message': 'RifleAxis API is running',
+            'database': 'connected',
+            'features': ['auth', 'loadout', 'ballistic', 'training']
+        }, 200
+    return {
+        'status': 'unhealthy',
+        'message': 'Database connection failed',
+        'error': error
+    }, 500
+
+def database_info():
+    """Database info endpoint"""
+    try:
+        counts = _get_table_counts()
+
+        return {
+            'status': 'success',
+            'tables': {
+                'users': counts['users'],
+                'password_reset_tokens': counts['password_reset_tokens'],
+                'rifles': counts['rifles'],
+                'ammunition': counts['ammunition'],
+                'scopes': counts['scopes'],
+                'maintenance': counts['maintenance'],
+                'dope_entries': counts['dope_entries'],
+                'zero_entries': counts['zero_entries'],
+                'chronograph_data': counts['chronograph_data'],
+                'ballistic_calculations': counts['ballistic_calculations'],
+            },
+            'database': 'connected'
+        }, 200
+    except Exception as e:
+        return {
+            'status': 'error',
+            'message': 'Database query failed',
+            'error': str(e)
+        }, 500
+
+def cleanup_expired_tokens():
+    """Periodic cleanup endpoint (optional - can be called by cron job)"""
+    try:
+        from .services.auth_service import AuthService
+        auth_service = AuthService()
+        cleaned_count = auth_service.cleanup_all_expired_tokens()
+        return {
+            'status': 'success',
+            'message': f'Cleaned {cleaned_count} expired tokens'
+        }, 200
+    except Exception as e:
+        return {
+            'status': 'error',
+            'message': 'Cleanup failed',
+            'error': str(e)
+        }, 500
+
+# Blueprints by dotted import path, attribute name, and URL prefix
+_BLUEPRINTS = (
+    ('app.views.auth', 'auth_bp', '/api/auth'),
+    ('app.views.loadout', 'loadout_bp', '/api/loadout'),
+    ('app.views.ballistic', 'ballistic_bp', '/api/ballistic'),
+)
+
+def _register_blueprints(app):
+    """Resolve blueprints from dotted paths and register them.
+
+    View modules (and the service/model graph behind them) are imported
+    here, when the factory runs, rather than at package import time.
+    """
+    for module_path, attr, url_prefix in _BLUEPRINTS:
+        blueprint = getattr(importlib.import_module(module_path), attr)
+        app.register_blueprint(blueprint, url_prefix=url_prefix)
+
+def _import_models():
+    """Import all model modules so they register with SQLAlchemy.
+
+    Only create_all/migrations need every model loaded up front;
+    request handlers import the models they use themselves.
+    """
+    from .models import user, loadout, ballistic  # noqa: F401
+
+def _expected_schema_version():
+    """Fingerprint of the model metadata, used as the schema sentinel"""
+    import hashlib
+    return hashlib.sha1(repr(sorted(db.metadata.tables)).encode()).hexdigest()[:12]
+
+def _schema_is_current(expected):
+    """Check the stored schema sentinel against the expected version"""
+    try:
+        current = db.session.execute(text('SELECT version FROM schema_meta')).scalar()
+        return current == expected
+    except Exception:
+        db.session.rollback()
+        return False
+
+def _store_schema_version(version):
+    """Record the schema sentinel after create_all has run"""
+    db.session.execute(text('CREATE TABLE IF NOT EXISTS schema_meta (version VARCHAR(32) NOT NULL)'))
+    db.session.execute(text('DELETE FROM schema_meta'))
+    db.session.execute(text('INSERT INTO schema_meta (version) VALUES (:version)'), {'version': version})
+    db.session.commit()
+
+def prepare_database(app):
+    """Create database tables and print the startup report.
+
+    Called once at startup (container entrypoint, `flask init-db`, or
+    run.py) instead of inside create_app, so per-worker factory calls
+    skip the DDL and verification queries entirely. The verbose count
+    report can be silenced with DB_VERBOSE_STARTUP=false.
+    """
+    verbose = app.config.get('DB_VERBOSE_STARTUP', True)
+    _import_models()
     with app.app_context():
         try:
             # Check if database connection works (SQLAlchemy 2.0+ compatible)
             with db.engine.connect() as connection:
-                connection.execute(text('SELECT 1'))
-            print("✅ Database connection successful")
-            
-            # Create all tables if they don't exist
-            db.create_all()
-            print("✅ Database tables created/verified successfully")
-            
-            # Check if tables exist by trying to query them
+                connection.execute(_PING)
+            if verbose:
+                print("✅ Database connection successful")
+
+            # Create all tables if they don't exist, skipping the
+            # catalog introspection entirely when the stored schema
+            # sentinel already matches the models
+            expected = _expected_schema_version()
+            if _schema_is_current(expected):
+                if verbose:
+                    print("✅ Database schema already current")
+            else:
+                db.create_all()
+                _store_schema_version(expected)
+                if verbose:
+                    print("✅ Database tables created/verified successfully")
+            _existing_table_names(refresh=True)
+
+            # Check if tables exist by querying them all at once
             try:
-                user_count = db.session.execute(text('SELECT COUNT(*) FROM users')).scalar()
-                print(f"✅ Users table ready (current count: {user_count})")
-                
-                # Check new tables
-                rifle_count = db.session.execute(text('SELECT COUNT(*) FROM rifles')).scalar() if _table_exists('rifles') else 0
-                ammo_count = db.session.execute(text('SELECT COUNT(*) FROM ammunition')).scalar() if _table_exists('ammunition') else 0
-                scope_count = db.session.execute(text('SELECT COUNT(*) FROM scopes')).scalar() if _table_exists('scopes') else 0
-                maintenance_count = db.session.execute(text('SELECT COUNT(*) FROM maintenance')).scalar() if _table_exists('maintenance') else 0
-                
-                print(f"✅ Loadout tables ready - Rifles: {rifle_count}, Ammunition: {ammo_count}, Scopes: {scope_count}, Maintenance: {maintenance_count}")
-                
-                dope_count = db.session.execute(text('SELECT COUNT(*) FROM dope_entries')).scalar() if _table_exists('dope_entries') else 0
-                zero_count = db.session.execute(text('SELECT COUNT(*) FROM zero_entries')).scalar() if _table_exists('zero_entries') else 0
-                chrono_count = db.session.execute(text('SELECT COUNT(*) FROM chronograph_data')).scalar() if _table_exists('chronograph_data') else 0
-                calc_count = db.session.execute(text('SELECT COUNT(*) FROM ballistic_calculations')).scalar() if _table_exists('ballistic_calculations') else 0
-                
-                print(f"✅ Ballistic tables ready - DOPE: {dope_count}, Zero: {zero_count}, Chronograph: {chrono_count}, Calculations: {calc_count}")
-                
-                session_count = db.session.execute(text('SELECT COUNT(*) FROM training_sessions')).scalar() if _table_exists('training_sessions') else 0
-                sensor_count = db.session.execute(text('SELECT COUNT(*) FROM sensor_data')).scalar() if _table_exists('sensor_data') else 0
-                device_count = db.session.execute(text('SELECT COUNT(*) FROM device_connections')).scalar() if _table_exists('device_connections') else 0
-                
-                print(f"✅ Training tables ready - Sessions: {session_count}, Sensor Data: {sensor_count}, Devices: {device_count}")
-                
+                if verbose:
+                    counts = _get_table_counts()
+                    print(f"✅ Users table ready (current count: {counts['users']})")
+                    print(f"✅ Loadout tables ready - Rifles: {counts['rifles']}, Ammunition: {counts['ammunition']}, Scopes: {counts['scopes']}, Maintenance: {counts['maintenance']}")
+                    print(f"✅ Ballistic tables ready - DOPE: {counts['dope_entries']}, Zero: {counts['zero_entries']}, Chronograph: {counts['chronograph_data']}, Calculations: {counts['ballistic_calculations']}")
+                    print(f"✅ Training tables ready - Sessions: {counts['training_sessions']}, Sensor Data: {counts['sensor_data']}, Devices: {counts['device_connections']}")
+
             except Exception as e:
                 print(f"⚠️  Table verification issue: {e}")
                 # Try to create tables again
                 db.create_all()
                 print("✅ Tables recreated successfully")
-                
+
+            return True
+
         except Exception as e:
             print(f"❌ Database setup error: {e}")
             print("⚠️  Please check your database configuration in .env file")
-    
-    # Register blueprints
-    from .views.auth import auth_bp
-    from .views.loadout import loadout_bp
-    from .views.ballistic import ballistic_bp
-    
-    app.register_blueprint(auth_bp, url_prefix='/api/auth')
-    app.register_blueprint(loadout_bp, url_prefix='/api/loadout')
-    app.register_blueprint(ballistic_bp, url_prefix='/api/ballistic')
-    
-    # JWT error handlers
-    @jwt.expired_token_loader
-    def expired_token_callback(jwt_header, jwt_payload):
-        return {'message': 'Token has expired'}, 401
-    
-    @jwt.invalid_token_loader
-    def invalid_token_callback(error):
-        return {'message': 'Invalid token'}, 401
-    
-    @jwt.unauthorized_loader
-    def missing_token_callback(error):
-        return {'message': 'Authorization token is required'}, 401
-    
-    # Health check endpoint
-    @app.route('/api/health')
-    def health_check():
-        try:
-            # Test database connection (SQLAlchemy 2.0+ compatible)
-            with db.engine.connect() as connection:
-                connection.execute(text('SELECT 1'))
-            return {
-                'status': 'healthy', 
-                'message': 'RifleAxis API is running',
-                'database': 'connected',
-                'features': ['auth', 'loadout', 'ballistic', 'training']
-            }, 200
-        except Exception as e:
-            return {
-                'status': 'unhealthy',
-                'message': 'Database connection failed',
-                'error': str(e)
-            }, 500
-    
-    # Database info endpoint
-    @app.route('/api/db-info')
-    def database_info():
-        try:
-            from .models.user import User, PasswordResetToken
-            from .models.loadout import Rifle, Ammunition, Scope, Maintenance
-            from .models.ballistic import DopeEntry, ZeroEntry, ChronographData, BallisticCalculation
-            
-            user_count = db.session.execute(text('SELECT COUNT(*) FROM users')).scalar()
-            token_count = db.session.execute(text('SELECT COUNT(*) FROM password_reset_tokens')).scalar()
-            
-            # Loadout counts
-            rifle_count = db.session.execute(text('SELECT COUNT(*) FROM rifles')).scalar() if _table_exists('rifles') else 0
-            ammo_count = db.session.execute(text('SELECT COUNT(*) FROM ammunition')).scalar() if _table_exists('ammunition') else 0
-            scope_count = db.session.execute(text('SELECT COUNT(*) FROM scopes')).scalar() if _table_exists('scopes') else 0
-            maintenance_count = db.session.execute(text('SELECT COUNT(*) FROM maintenance')).scalar() if _table_exists('maintenance') else 0
-            
-            # Ballistic counts
-            dope_count = db.session.execute(text('SELECT COUNT(*) FROM dope_entries')).scalar() if _table_exists('dope_entries') else 0
-            zero_count = db.session.execute(text('SELECT COUNT(*) FROM zero_entries')).scalar() if _table_exists('zero_entries') else 0
-            chrono_count = db.session.execute(text('SELECT COUNT(*) FROM chronograph_data')).scalar() if _table_exists('chronograph_data') else 0
-            calc_count = db.session.execute(text('SELECT COUNT(*) FROM ballistic_calculations')).scalar() if _table_exists('ballistic_calculations') else 0
-            
-    
-            return {
-                'status': 'success',
-                'tables': {
-                    'users': user_count,
-                    'password_reset_tokens': token_count,
-                    'rifles': rifle_count,
-                    'ammunition': ammo_count,
-                    'scopes': scope_count,
-                    'maintenance': maintenance_count,
-                    'dope_entries': dope_count,
-                    'zero_entries': zero_count,
-                    'chronograph_data': chrono_count,
-                    'ballistic_calculations': calc_count,
-                },
-                'database': 'connected'
-            }, 200
-        except Exception as e:
-            return {
-                'status': 'error',
-                'message': 'Database query failed',
-                'error': str(e)
-            }, 500
-    
-    # Periodic cleanup endpoint (optional - can be called by cron job)
-    @app.route('/api/cleanup-expired-tokens')
-    def cleanup_expired_tokens():
-        try:
-            from .services.auth_service import AuthService
-            auth_service = AuthService()
-            cleaned_count = auth_service.cleanup_all_expired_tokens()
-            return {
-                'status': 'success',
-                'message': f'Cleaned {cleaned_count} expired tokens'
-            }, 200
-        except Exception as e:
-            return {
-                'status': 'error',
-                'message': 'Cleanup failed',
-                'error': str(e)
-            }, 500
-    
-    return app
+            return False
 
 def _table_exists(table_name):
-    """Check if a table exists in the database"""
-    try:
-        with db.engine.connect() as connection:
-            result = connection.execute(text(f"SELECT 1 FROM {table_name} LIMIT 1"))
-            return True
-    except:
-        return False
+    """Check if a table exists using the cached catalog metadata"""
+    return table_name in _existing_table_names()
 
 def init_database():
     """Initialize database with tables and basic data"""
@@ -257,9 +448,6 @@ def create_sample_data(user_id):
                 is_active=True,
                 notes='Sample rifle for development'
             )
-            rifle.save()
-            print("✅ Sample rifle created")
-            
             # Create sample ammunition
             ammunition = Ammunition(
                 user_id=user_id,
@@ -271,9 +459,7 @@ def create_sample_data(user_id):
                 temp_stable=True,
                 notes='Sample ammunition for development'
             )
-            ammunition.save()
-            print("✅ Sample ammunition created")
-            
+
             # Create sample scope
             scope = Scope(
                 user_id=user_id,
@@ -288,9 +474,12 @@ def create_sample_data(user_id):
                 zero_data=[{'distance': 100, 'units': 'yards', 'elevation': '0', 'windage': '0'}],
                 notes='Sample scope for development'
             )
-            scope.save()
-            print("✅ Sample scope created")
-            
+
+            # Stage the independent rows and flush once so rifle.id is
+            # assigned for the maintenance task below
+            db.session.add_all([rifle, ammunition, scope])
+            db.session.flush()
+
             # Create sample maintenance task
             maintenance = Maintenance(
                 user_id=user_id,
@@ -301,8 +490,16 @@ def create_sample_data(user_id):
                 current_count=0,
                 notes='Clean barrel every 500 rounds'
             )
-            maintenance.save()
+            db.session.add(maintenance)
+
+            # One commit for the whole sample set instead of a commit
+            # per object
+            db.session.commit()
+            print("✅ Sample rifle created")
+            print("✅ Sample ammunition created")
+            print("✅ Sample scope created")
             print("✅ Sample maintenance task created")
-            
+
     except Exception as e:
+        db.session.rollback()
         print(f"❌ Failed to create sample data: {e}")
\ No newline at end of file
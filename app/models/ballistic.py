@@ -1,48 +1,128 @@
 # app/models/ballistic.py
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Float, ForeignKey
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy import Column, Integer, String, TIMESTAMP, Boolean, Text, Float, Numeric, ForeignKey, CheckConstraint, Index, func, select, delete, text, tuple_, DDL, event
+from sqlalchemy.dialects.postgresql import ARRAY, JSON, JSONB, UUID
+from sqlalchemy.dialects.sqlite import DATETIME as SQLITE_DATETIME
+
+# Binary JSONB on PostgreSQL (no text reparse on read, GIN-indexable);
+# plain JSON on SQLite test databases
+_JSONB = JSONB().with_variant(JSON(), 'sqlite')
+
+# Contiguous float4[] on PostgreSQL - unnest/avg/stddev run as C
+# aggregates without reparsing JSON text; SQLite tests fall back to JSON
+_FLOAT_ARRAY = ARRAY(Float).with_variant(JSON(), 'sqlite')
+
+# Timezone-aware timestamps on PostgreSQL. The SQLite variant truncates
+# microseconds so bound parameters compare consistently against values
+# stored by CURRENT_TIMESTAMP (which has second resolution) - without
+# this, keyset cursors misbehave on test databases
+_TIMESTAMPTZ = TIMESTAMP(timezone=True).with_variant(
+    SQLITE_DATETIME(truncate_microseconds=True), 'sqlite'
+)
+from sqlalchemy.orm import defer, raiseload, selectinload
+import re
 import uuid
+from decimal import Decimal
+from functools import lru_cache
 from app import db
 
+# Scope adjustments arrive as '2.5 MOA', '1.2 MIL', or a bare number.
+# They are stored split into a numeric value plus unit so SQL can
+# range-filter and do ballistic math without string parsing.
+_MEASURE_RE = re.compile(r'^\s*(-?\d+(?:\.\d+)?)\s*(MOA|MIL)?\s*$', re.IGNORECASE)
+
+
+def _parse_measure(raw):
+    """Split '2.5 MOA' / '2.5' / 2.5 into (Decimal value, unit or None)"""
+    if isinstance(raw, (int, float, Decimal)):
+        return Decimal(str(raw)), None
+    match = _MEASURE_RE.match(str(raw))
+    if not match:
+        raise ValueError(f"Unparseable scope adjustment: {raw!r}")
+    value, unit = match.groups()
+    return Decimal(value), unit.upper() if unit else None
+
+
+def _format_measure(value, unit):
+    """Rebuild the display string from the stored value + unit"""
+    text = '%g' % value
+    return f'{text} {unit}' if unit else text
+
+
+@lru_cache(maxsize=4096)
+def _iso(dt):
+    """Memoized datetime -> ISO-8601 string (None passes through)
+
+    Rows are serialized repeatedly across list endpoints and usually
+    share timestamps (created_at == updated_at until first edit), so
+    caching the isoformat() result saves most of the strftime work.
+    """
+    return dt.isoformat() if dt else None
+
 class DopeEntry(db.Model):
     """DOPE Entry Model - Data On Previous Engagements"""
     
     __tablename__ = 'dope_entries'
     
     # Primary fields
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey('users.id'), nullable=False)
-    rifle_id = Column(String(36), ForeignKey('rifles.id'), nullable=False)
-    ammunition_id = Column(String(36), ForeignKey('ammunition.id'), nullable=False)
-    
-    # DOPE data
+    # Native UUID on PostgreSQL (16-byte keys, denser index pages than
+    # 36-char text); values stay strings on the Python side
+    id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(UUID(as_uuid=False), ForeignKey('users.id'), nullable=False)
+    rifle_id = Column(UUID(as_uuid=False), ForeignKey('rifles.id'), nullable=False)
+    ammunition_id = Column(UUID(as_uuid=False), ForeignKey('ammunition.id'), nullable=False)
+    
+    # DOPE data - adjustments stored structured (value + unit), not as
+    # display strings, so range queries are index-backed B-tree lookups
     distance = Column(Integer, nullable=False)
-    elevation = Column(String(100), nullable=False)
-    windage = Column(String(100), nullable=False)
+    elevation_value = Column(Numeric(6, 2), nullable=False)
+    elevation_unit = Column(String(10), nullable=True)
+    windage_value = Column(Numeric(6, 2), nullable=False)
+    windage_unit = Column(String(10), nullable=True)
     notes = Column(Text, nullable=True)
     
-    # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
-    
+    # Timestamps - generated by the database (TIMESTAMPTZ keeps the
+    # zone; no Python datetime allocation or parameter marshal per row)
+    created_at = Column(_TIMESTAMPTZ, server_default=func.now(), nullable=False)
+    updated_at = Column(_TIMESTAMPTZ, server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    # Composite index matches find_by_rifle_id's filter + ORDER BY
+    # distance, so the sort comes straight off the index
+    __table_args__ = (
+        Index('ix_dope_rifle_distance', 'rifle_id', 'distance'),
+        Index('ix_dope_user', 'user_id'),
+        CheckConstraint("elevation_unit IN ('MOA', 'MIL')", name='ck_dope_elevation_unit'),
+        CheckConstraint("windage_unit IN ('MOA', 'MIL')", name='ck_dope_windage_unit'),
+    )
+
+    # Fetch server-generated timestamps via RETURNING on insert
+    __mapper_args__ = {'eager_defaults': True}
+
     # Relationships
-    rifle = db.relationship('Rifle', backref=db.backref('dope_entries', lazy=True))
-    ammunition = db.relationship('Ammunition', backref=db.backref('dope_entries', lazy=True))
+    rifle = db.relationship('Rifle', back_populates='dope_entries')
+    ammunition = db.relationship('Ammunition', back_populates='dope_entries')
     
     def __init__(self, user_id, rifle_id, ammunition_id, distance, elevation, windage, **kwargs):
         self.user_id = user_id
         self.rifle_id = rifle_id
         self.ammunition_id = ammunition_id
         self.distance = distance
-        self.elevation = elevation
-        self.windage = windage
+        self.elevation_value, self.elevation_unit = _parse_measure(elevation)
+        self.windage_value, self.windage_unit = _parse_measure(windage)
         
-        # Set optional fields
-        for key, value in kwargs.items():
-            if hasattr(self, key):
-                setattr(self, key, value)
-    
+        # Optional fields - explicit lookup instead of a hasattr/setattr
+        # loop, which probes the instrumented descriptor twice per key
+        self.notes = kwargs.get('notes')
+    
+    @property
+    def elevation(self):
+        """Display string for the stored elevation ('2.5 MOA')"""
+        return _format_measure(self.elevation_value, self.elevation_unit)
+
+    @property
+    def windage(self):
+        """Display string for the stored windage"""
+        return _format_measure(self.windage_value, self.windage_unit)
+
     def to_dict(self):
         """Convert DOPE entry to dictionary for JSON response"""
         return {
@@ -53,44 +133,147 @@ class DopeEntry(db.Model):
             'elevation': self.elevation,
             'windage': self.windage,
             'notes': self.notes,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'updatedAt': self.updated_at.isoformat() if self.updated_at else None,
+            'createdAt': _iso(self.created_at),
+            'updatedAt': _iso(self.updated_at),
         }
     
+    @classmethod
+    def save_many(cls, objs):
+        """Save many DOPE entries to database in a single transaction"""
+        try:
+            db.session.bulk_save_objects(objs)
+            db.session.commit()
+            return True
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
     def save(self):
-        """Save DOPE entry to database"""
+        """Stage DOPE entry for the end-of-request commit
+
+        Flushes (so generated ids/timestamps are available) but leaves
+        the commit to the after_request hook - one fsync per request
+        no matter how many entities a handler saves.
+        """
         try:
             db.session.add(self)
-            db.session.commit()
+            db.session.flush()
             return True
         except Exception as e:
             db.session.rollback()
             raise e
     
     def delete(self):
-        """Delete DOPE entry from database"""
+        """Stage DOPE entry deletion for the end-of-request commit"""
         try:
             db.session.delete(self)
-            db.session.commit()
+            db.session.flush()
             return True
         except Exception as e:
             db.session.rollback()
             raise e
     
+    @classmethod
+    def delete_by_ids(cls, ids):
+        """Delete many DOPE entries in one statement (no per-row round-trips)"""
+        if not ids:
+            return 0
+        try:
+            result = db.session.execute(
+                delete(cls).where(cls.id.in_(ids)).execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            return result.rowcount
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
+    @classmethod
+    def delete_by_user_id(cls, user_id):
+        """Delete all of a user's DOPE entries in one statement"""
+        try:
+            result = db.session.execute(
+                delete(cls).where(cls.user_id == user_id).execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            return result.rowcount
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
     @staticmethod
     def find_by_rifle_id(rifle_id):
         """Find all DOPE entries by rifle ID, sorted by distance"""
-        return DopeEntry.query.filter_by(rifle_id=rifle_id).order_by(DopeEntry.distance).all()
+        return db.session.scalars(
+            select(DopeEntry).where(DopeEntry.rifle_id == rifle_id).order_by(DopeEntry.distance)
+        ).all()
     
     @staticmethod
     def find_by_user_id(user_id):
-        """Find all DOPE entries by user ID"""
-        return DopeEntry.query.filter_by(user_id=user_id).all()
+        """Find all DOPE entries by user ID
+
+        Related rifle/ammunition rows load in two batched SELECT IN
+        queries; raiseload turns any other accidental lazy load into
+        a loud error instead of a silent N+1.
+        """
+        return db.session.scalars(
+            select(DopeEntry).options(
+                selectinload(DopeEntry.rifle),
+                selectinload(DopeEntry.ammunition),
+                raiseload('*'),
+            ).where(DopeEntry.user_id == user_id)
+        ).all()
     
+
+    @staticmethod
+    def list_dicts_by_user(user_id):
+        """List a user's DOPE entries as plain dicts via a Core select
+
+        Skips ORM hydration (identity map, attribute instrumentation)
+        entirely - list endpoints only need the dict shape to_dict
+        produces, so rows are read straight from Row._mapping.
+        """
+        rows = db.session.execute(
+            select(
+                DopeEntry.id, DopeEntry.rifle_id, DopeEntry.ammunition_id,
+                DopeEntry.distance, DopeEntry.elevation_value,
+                DopeEntry.elevation_unit, DopeEntry.windage_value,
+                DopeEntry.windage_unit, DopeEntry.notes,
+                DopeEntry.created_at, DopeEntry.updated_at,
+            ).where(DopeEntry.user_id == user_id)
+        )
+        return [
+            {
+                'id': m['id'],
+                'rifleId': m['rifle_id'],
+                'ammunitionId': m['ammunition_id'],
+                'distance': m['distance'],
+                'elevation': _format_measure(m['elevation_value'], m['elevation_unit']),
+                'windage': _format_measure(m['windage_value'], m['windage_unit']),
+                'notes': m['notes'],
+                'createdAt': _iso(m['created_at']),
+                'updatedAt': _iso(m['updated_at']),
+            }
+            for m in (row._mapping for row in rows)
+        ]
+
+    @staticmethod
+    def stream_dicts_by_user(user_id, batch_size=500):
+        """Stream DOPE entries for a user as dicts, {batch_size} rows at a time
+
+        Uses a server-side cursor (stream_results) with yield_per so
+        memory stays bounded no matter how many rows the user has.
+        """
+        stmt = select(DopeEntry).where(DopeEntry.user_id == user_id).execution_options(
+            stream_results=True, yield_per=batch_size
+        )
+        for row in db.session.scalars(stmt):
+            yield row.to_dict()
+
     @staticmethod
     def find_by_id(entry_id):
-        """Find DOPE entry by ID"""
-        return DopeEntry.query.filter_by(id=entry_id).first()
+        """Find DOPE entry by ID (identity map first, no SQL on repeats)"""
+        return db.session.get(DopeEntry, entry_id)
 
 
 class ZeroEntry(db.Model):
@@ -99,9 +282,11 @@ class ZeroEntry(db.Model):
     __tablename__ = 'zero_entries'
     
     # Primary fields
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey('users.id'), nullable=False)
-    rifle_id = Column(String(36), ForeignKey('rifles.id'), nullable=False)
+    # Native UUID on PostgreSQL (16-byte keys, denser index pages than
+    # 36-char text); values stay strings on the Python side
+    id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(UUID(as_uuid=False), ForeignKey('users.id'), nullable=False)
+    rifle_id = Column(UUID(as_uuid=False), ForeignKey('rifles.id'), nullable=False)
     
     # Zero data
     distance = Column(Integer, nullable=False)
@@ -109,12 +294,27 @@ class ZeroEntry(db.Model):
     confirmed = Column(Boolean, default=False, nullable=False)
     notes = Column(Text, nullable=True)
     
-    # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
-    
+    # Timestamps - generated by the database (TIMESTAMPTZ keeps the
+    # zone; no Python datetime allocation or parameter marshal per row)
+    created_at = Column(_TIMESTAMPTZ, server_default=func.now(), nullable=False)
+    updated_at = Column(_TIMESTAMPTZ, server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    # Composite index matches find_by_rifle_id's filter + newest-first
+    # sort; the partial index covers the common "confirmed zeros for a
+    # rifle" lookup and only stores the confirmed fraction of rows
+    __table_args__ = (
+        Index('ix_zero_rifle_created', 'rifle_id', created_at.desc()),
+        Index('ix_zero_user', 'user_id'),
+        Index('ix_zero_confirmed_rifle', 'rifle_id', 'distance',
+              postgresql_where=text('confirmed = true'),
+              sqlite_where=text('confirmed = 1')),
+    )
+
+    # Fetch server-generated timestamps via RETURNING on insert
+    __mapper_args__ = {'eager_defaults': True}
+
     # Relationship
-    rifle = db.relationship('Rifle', backref=db.backref('zero_entries', lazy=True))
+    rifle = db.relationship('Rifle', back_populates='zero_entries')
     
     def __init__(self, user_id, rifle_id, distance, poi_offset, confirmed=False, **kwargs):
         self.user_id = user_id
@@ -123,10 +323,9 @@ class ZeroEntry(db.Model):
         self.poi_offset = poi_offset
         self.confirmed = confirmed
         
-        # Set optional fields
-        for key, value in kwargs.items():
-            if hasattr(self, key):
-                setattr(self, key, value)
+        # Optional fields - explicit lookup instead of a hasattr/setattr
+        # loop, which probes the instrumented descriptor twice per key
+        self.notes = kwargs.get('notes')
     
     def to_dict(self):
         """Convert zero entry to dictionary for JSON response"""
@@ -137,44 +336,125 @@ class ZeroEntry(db.Model):
             'poiOffset': self.poi_offset,
             'confirmed': self.confirmed,
             'notes': self.notes,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'updatedAt': self.updated_at.isoformat() if self.updated_at else None,
+            'createdAt': _iso(self.created_at),
+            'updatedAt': _iso(self.updated_at),
         }
     
+    @classmethod
+    def save_many(cls, objs):
+        """Save many zero entries to database in a single transaction"""
+        try:
+            db.session.bulk_save_objects(objs)
+            db.session.commit()
+            return True
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
     def save(self):
-        """Save zero entry to database"""
+        """Stage zero entry for the end-of-request commit
+
+        Flushes (so generated ids/timestamps are available) but leaves
+        the commit to the after_request hook - one fsync per request
+        no matter how many entities a handler saves.
+        """
         try:
             db.session.add(self)
-            db.session.commit()
+            db.session.flush()
             return True
         except Exception as e:
             db.session.rollback()
             raise e
     
     def delete(self):
-        """Delete zero entry from database"""
+        """Stage zero entry deletion for the end-of-request commit"""
         try:
             db.session.delete(self)
-            db.session.commit()
+            db.session.flush()
             return True
         except Exception as e:
             db.session.rollback()
             raise e
     
+    @classmethod
+    def delete_by_ids(cls, ids):
+        """Delete many zero entries in one statement (no per-row round-trips)"""
+        if not ids:
+            return 0
+        try:
+            result = db.session.execute(
+                delete(cls).where(cls.id.in_(ids)).execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            return result.rowcount
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
+    @classmethod
+    def delete_by_user_id(cls, user_id):
+        """Delete all of a user's zero entries in one statement"""
+        try:
+            result = db.session.execute(
+                delete(cls).where(cls.user_id == user_id).execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            return result.rowcount
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
     @staticmethod
     def find_by_rifle_id(rifle_id):
         """Find all zero entries by rifle ID, sorted by created date (newest first)"""
-        return ZeroEntry.query.filter_by(rifle_id=rifle_id).order_by(ZeroEntry.created_at.desc()).all()
+        return db.session.scalars(
+            select(ZeroEntry).where(ZeroEntry.rifle_id == rifle_id).order_by(ZeroEntry.created_at.desc())
+        ).all()
     
+    @staticmethod
+    def page_by_rifle_id(rifle_id, after_created_at=None, after_id=None, limit=50):
+        """One keyset page of zero entries for a rifle, newest first
+
+        Pass the last row's (created_at, id) back as the cursor for
+        the next page; the (rifle_id, created_at DESC) index serves
+        every page in O(log N), unlike deep OFFSET scans.
+        """
+        stmt = select(ZeroEntry).where(ZeroEntry.rifle_id == rifle_id)
+        if after_created_at is not None:
+            stmt = stmt.where(
+                tuple_(ZeroEntry.created_at, ZeroEntry.id) < (after_created_at, after_id)
+            )
+        stmt = stmt.order_by(ZeroEntry.created_at.desc(), ZeroEntry.id.desc()).limit(limit)
+        return db.session.scalars(stmt).all()
+
     @staticmethod
     def find_by_user_id(user_id):
-        """Find all zero entries by user ID"""
-        return ZeroEntry.query.filter_by(user_id=user_id).all()
+        """Find all zero entries by user ID (rifles batched, no lazy loads)"""
+        return db.session.scalars(
+            select(ZeroEntry).options(
+                selectinload(ZeroEntry.rifle),
+                raiseload('*'),
+            ).where(ZeroEntry.user_id == user_id)
+        ).all()
     
+
+    @staticmethod
+    def stream_dicts_by_user(user_id, batch_size=500):
+        """Stream zero entries for a user as dicts, {batch_size} rows at a time
+
+        Uses a server-side cursor (stream_results) with yield_per so
+        memory stays bounded no matter how many rows the user has.
+        """
+        stmt = select(ZeroEntry).where(ZeroEntry.user_id == user_id).execution_options(
+            stream_results=True, yield_per=batch_size
+        )
+        for row in db.session.scalars(stmt):
+            yield row.to_dict()
+
     @staticmethod
     def find_by_id(entry_id):
-        """Find zero entry by ID"""
-        return ZeroEntry.query.filter_by(id=entry_id).first()
+        """Find zero entry by ID (identity map first, no SQL on repeats)"""
+        return db.session.get(ZeroEntry, entry_id)
 
 
 class ChronographData(db.Model):
@@ -183,25 +463,38 @@ class ChronographData(db.Model):
     __tablename__ = 'chronograph_data'
     
     # Primary fields
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey('users.id'), nullable=False)
-    rifle_id = Column(String(36), ForeignKey('rifles.id'), nullable=False)
-    ammunition_id = Column(String(36), ForeignKey('ammunition.id'), nullable=False)
+    # Native UUID on PostgreSQL (16-byte keys, denser index pages than
+    # 36-char text); values stay strings on the Python side
+    id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(UUID(as_uuid=False), ForeignKey('users.id'), nullable=False)
+    rifle_id = Column(UUID(as_uuid=False), ForeignKey('rifles.id'), nullable=False)
+    ammunition_id = Column(UUID(as_uuid=False), ForeignKey('ammunition.id'), nullable=False)
     
     # Chronograph data
-    velocities = Column(JSON, nullable=False)  # Array of velocity readings
+    velocities = Column(_FLOAT_ARRAY, nullable=False)  # Array of velocity readings
     average = Column(Float, nullable=False)
     extreme_spread = Column(Float, nullable=False)
     standard_deviation = Column(Float, nullable=False)
     notes = Column(Text, nullable=True)
     
-    # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
-    
+    # Timestamps - generated by the database (TIMESTAMPTZ keeps the
+    # zone; no Python datetime allocation or parameter marshal per row)
+    created_at = Column(_TIMESTAMPTZ, server_default=func.now(), nullable=False)
+    updated_at = Column(_TIMESTAMPTZ, server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    # Composite index matches find_by_rifle_id's filter + newest-first sort
+    __table_args__ = (
+        Index('ix_chrono_rifle_created', 'rifle_id', created_at.desc()),
+        Index('ix_chrono_user', 'user_id'),
+        Index('ix_chrono_velocities_gin', 'velocities', postgresql_using='gin'),
+    )
+
+    # Fetch server-generated timestamps via RETURNING on insert
+    __mapper_args__ = {'eager_defaults': True}
+
     # Relationships
-    rifle = db.relationship('Rifle', backref=db.backref('chronograph_data', lazy=True))
-    ammunition = db.relationship('Ammunition', backref=db.backref('chronograph_data', lazy=True))
+    rifle = db.relationship('Rifle', back_populates='chronograph_data')
+    ammunition = db.relationship('Ammunition', back_populates='chronograph_data')
     
     def __init__(self, user_id, rifle_id, ammunition_id, velocities, average, extreme_spread, standard_deviation, **kwargs):
         self.user_id = user_id
@@ -212,11 +505,25 @@ class ChronographData(db.Model):
         self.extreme_spread = extreme_spread
         self.standard_deviation = standard_deviation
         
-        # Set optional fields
-        for key, value in kwargs.items():
-            if hasattr(self, key):
-                setattr(self, key, value)
+        # Optional fields - explicit lookup instead of a hasattr/setattr
+        # loop, which probes the instrumented descriptor twice per key
+        self.notes = kwargs.get('notes')
     
+    def to_summary_dict(self):
+        """Convert chronograph data to dictionary without the velocities
+        payload - what list endpoints need"""
+        return {
+            'id': self.id,
+            'rifleId': self.rifle_id,
+            'ammunitionId': self.ammunition_id,
+            'average': self.average,
+            'extremeSpread': self.extreme_spread,
+            'standardDeviation': self.standard_deviation,
+            'notes': self.notes,
+            'createdAt': _iso(self.created_at),
+            'updatedAt': _iso(self.updated_at),
+        }
+
     def to_dict(self):
         """Convert chronograph data to dictionary for JSON response"""
         return {
@@ -228,44 +535,217 @@ class ChronographData(db.Model):
             'extremeSpread': self.extreme_spread,
             'standardDeviation': self.standard_deviation,
             'notes': self.notes,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'updatedAt': self.updated_at.isoformat() if self.updated_at else None,
+            'createdAt': _iso(self.created_at),
+            'updatedAt': _iso(self.updated_at),
         }
     
+    @classmethod
+    def save_many(cls, objs):
+        """Save many chronograph data rows to database in a single transaction"""
+        try:
+            db.session.bulk_save_objects(objs)
+            db.session.commit()
+            return True
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
     def save(self):
-        """Save chronograph data to database"""
+        """Stage chronograph data for the end-of-request commit
+
+        Flushes (so generated ids/timestamps are available) but leaves
+        the commit to the after_request hook - one fsync per request
+        no matter how many entities a handler saves.
+        """
         try:
             db.session.add(self)
-            db.session.commit()
+            db.session.flush()
             return True
         except Exception as e:
             db.session.rollback()
             raise e
     
     def delete(self):
-        """Delete chronograph data from database"""
+        """Stage chronograph data deletion for the end-of-request commit"""
         try:
             db.session.delete(self)
-            db.session.commit()
+            db.session.flush()
             return True
         except Exception as e:
             db.session.rollback()
             raise e
     
+    @classmethod
+    def delete_by_ids(cls, ids):
+        """Delete many chronograph rows in one statement (no per-row round-trips)"""
+        if not ids:
+            return 0
+        try:
+            result = db.session.execute(
+                delete(cls).where(cls.id.in_(ids)).execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            return result.rowcount
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
+    @classmethod
+    def delete_by_user_id(cls, user_id):
+        """Delete all of a user's chronograph rows in one statement"""
+        try:
+            result = db.session.execute(
+                delete(cls).where(cls.user_id == user_id).execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            return result.rowcount
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def recompute_stats(data_id):
+        """Recompute the stored aggregates from the velocities array
+
+        On PostgreSQL the avg/spread/stddev run as C aggregates over
+        unnest(velocities) inside a single UPDATE - the array never
+        crosses the wire. SQLite test databases fall back to Python.
+        (A generated column would keep this fully declarative, but
+        Postgres generated columns cannot contain subqueries.)
+        """
+        try:
+            if db.session.get_bind().dialect.name == 'postgresql':
+                db.session.execute(text(
+                    "UPDATE chronograph_data SET"
+                    " average = s.avg_v,"
+                    " extreme_spread = s.spread,"
+                    " standard_deviation = s.sd"
+                    " FROM (SELECT avg(v) AS avg_v, max(v) - min(v) AS spread,"
+                    "              coalesce(stddev_samp(v), 0) AS sd"
+                    "       FROM chronograph_data, unnest(velocities) AS v"
+                    "       WHERE id = :id) s"
+                    " WHERE id = :id"
+                ), {'id': data_id})
+            else:
+                import statistics
+                row = db.session.get(ChronographData, data_id)
+                if row is None:
+                    return False
+                readings = row.velocities or []
+                row.average = statistics.fmean(readings) if readings else 0
+                row.extreme_spread = (max(readings) - min(readings)) if readings else 0
+                row.standard_deviation = statistics.stdev(readings) if len(readings) > 1 else 0
+            db.session.commit()
+            return True
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def velocity_trend_by_rifle(rifle_id, window=5):
+        """Rolling-average velocity per session for dashboard trend plots
+
+        The moving window runs server-side as a window function over
+        the stored averages instead of re-aggregating in Python.
+        """
+        rolling = func.avg(ChronographData.average).over(
+            order_by=ChronographData.created_at,
+            rows=(-(window - 1), 0),
+        ).label('rolling_average')
+        rows = db.session.execute(
+            select(
+                ChronographData.id, ChronographData.created_at,
+                ChronographData.average, rolling,
+            ).where(ChronographData.rifle_id == rifle_id)
+            .order_by(ChronographData.created_at)
+        )
+        return [
+            {
+                'id': m['id'],
+                'createdAt': _iso(m['created_at']),
+                'average': m['average'],
+                'rollingAverage': m['rolling_average'],
+            }
+            for m in (row._mapping for row in rows)
+        ]
+
     @staticmethod
     def find_by_rifle_id(rifle_id):
-        """Find all chronograph data by rifle ID, sorted by created date (newest first)"""
-        return ChronographData.query.filter_by(rifle_id=rifle_id).order_by(ChronographData.created_at.desc()).all()
+        """Find all chronograph data by rifle ID, sorted by created date (newest first)
+
+        The velocities array is deferred - list views only need the
+        stored aggregates, so the heavy JSON payload is fetched only
+        when an individual record is accessed.
+        """
+        return db.session.scalars(
+            select(ChronographData).options(defer(ChronographData.velocities))
+            .where(ChronographData.rifle_id == rifle_id)
+            .order_by(ChronographData.created_at.desc())
+        ).all()
     
+    @staticmethod
+    def page_by_rifle_id(rifle_id, after_created_at=None, after_id=None, limit=50):
+        """One keyset page of chronograph sessions for a rifle, newest first
+
+        Pass the last row's (created_at, id) back as the cursor for
+        the next page; the (rifle_id, created_at DESC) index serves
+        every page in O(log N), unlike deep OFFSET scans.
+        """
+        stmt = select(ChronographData).options(defer(ChronographData.velocities)).where(
+            ChronographData.rifle_id == rifle_id
+        )
+        if after_created_at is not None:
+            stmt = stmt.where(
+                tuple_(ChronographData.created_at, ChronographData.id) < (after_created_at, after_id)
+            )
+        stmt = stmt.order_by(ChronographData.created_at.desc(), ChronographData.id.desc()).limit(limit)
+        return db.session.scalars(stmt).all()
+
     @staticmethod
     def find_by_user_id(user_id):
-        """Find all chronograph data by user ID"""
-        return ChronographData.query.filter_by(user_id=user_id).all()
+        """Find all chronograph data by user ID (velocities deferred,
+        rifle/ammunition batched, no lazy loads)"""
+        return db.session.scalars(
+            select(ChronographData).options(
+                defer(ChronographData.velocities),
+                selectinload(ChronographData.rifle),
+                selectinload(ChronographData.ammunition),
+                raiseload('*'),
+            ).where(ChronographData.user_id == user_id)
+        ).all()
     
+
+    @staticmethod
+    def stream_dicts_by_user(user_id, batch_size=500):
+        """Stream chronograph summaries for a user as dicts, {batch_size} rows at a time
+
+        Uses a server-side cursor (stream_results) with yield_per so
+        memory stays bounded no matter how many rows the user has.
+        """
+        stmt = select(ChronographData).options(
+            defer(ChronographData.velocities)
+        ).where(ChronographData.user_id == user_id).execution_options(
+            stream_results=True, yield_per=batch_size
+        )
+        for row in db.session.scalars(stmt):
+            yield row.to_summary_dict()
+
     @staticmethod
     def find_by_id(data_id):
-        """Find chronograph data by ID"""
-        return ChronographData.query.filter_by(id=data_id).first()
+        """Find chronograph data by ID (identity map first, no SQL on repeats)"""
+        return db.session.get(ChronographData, data_id)
+
+
+# Guard against degenerate sessions; array_length() is Postgres-only so
+# the constraint is skipped on SQLite test databases
+event.listen(
+    ChronographData.__table__,
+    'after_create',
+    DDL(
+        "ALTER TABLE chronograph_data ADD CONSTRAINT ck_chrono_velocities_len "
+        "CHECK (array_length(velocities, 1) BETWEEN 1 AND 1024)"
+    ).execute_if(dialect='postgresql'),
+)
 
 
 class BallisticCalculation(db.Model):
@@ -274,10 +754,12 @@ class BallisticCalculation(db.Model):
     __tablename__ = 'ballistic_calculations'
     
     # Primary fields
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey('users.id'), nullable=False)
-    rifle_id = Column(String(36), ForeignKey('rifles.id'), nullable=False)
-    ammunition_id = Column(String(36), ForeignKey('ammunition.id'), nullable=False)
+    # Native UUID on PostgreSQL (16-byte keys, denser index pages than
+    # 36-char text); values stay strings on the Python side
+    id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(UUID(as_uuid=False), ForeignKey('users.id'), nullable=False)
+    rifle_id = Column(UUID(as_uuid=False), ForeignKey('rifles.id'), nullable=False)
+    ammunition_id = Column(UUID(as_uuid=False), ForeignKey('ammunition.id'), nullable=False)
     
     # Calculation parameters
     ballistic_coefficient = Column(Float, nullable=False)
@@ -287,17 +769,28 @@ class BallisticCalculation(db.Model):
     wind_direction = Column(Float, nullable=False)
     
     # Calculation results (stored as JSON array)
-    trajectory_data = Column(JSON, nullable=False)
+    trajectory_data = Column(_JSONB, nullable=False)
     
     notes = Column(Text, nullable=True)
     
-    # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
-    
+    # Timestamps - generated by the database (TIMESTAMPTZ keeps the
+    # zone; no Python datetime allocation or parameter marshal per row)
+    created_at = Column(_TIMESTAMPTZ, server_default=func.now(), nullable=False)
+    updated_at = Column(_TIMESTAMPTZ, server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    # Composite index matches find_by_rifle_id's filter + newest-first sort
+    __table_args__ = (
+        Index('ix_calc_rifle_created', 'rifle_id', created_at.desc()),
+        Index('ix_calc_user', 'user_id'),
+        Index('ix_ballistic_trajectory_gin', 'trajectory_data', postgresql_using='gin'),
+    )
+
+    # Fetch server-generated timestamps via RETURNING on insert
+    __mapper_args__ = {'eager_defaults': True}
+
     # Relationships
-    rifle = db.relationship('Rifle', backref=db.backref('ballistic_calculations', lazy=True))
-    ammunition = db.relationship('Ammunition', backref=db.backref('ballistic_calculations', lazy=True))
+    rifle = db.relationship('Rifle', back_populates='ballistic_calculations')
+    ammunition = db.relationship('Ammunition', back_populates='ballistic_calculations')
     
     def __init__(self, user_id, rifle_id, ammunition_id, ballistic_coefficient, muzzle_velocity, 
                  target_distance, wind_speed, wind_direction, trajectory_data, **kwargs):
@@ -311,10 +804,9 @@ class BallisticCalculation(db.Model):
         self.wind_direction = wind_direction
         self.trajectory_data = trajectory_data
         
-        # Set optional fields
-        for key, value in kwargs.items():
-            if hasattr(self, key):
-                setattr(self, key, value)
+        # Optional fields - explicit lookup instead of a hasattr/setattr
+        # loop, which probes the instrumented descriptor twice per key
+        self.notes = kwargs.get('notes')
     
     def to_dict(self):
         """Convert ballistic calculation to dictionary for JSON response"""
@@ -329,41 +821,125 @@ class BallisticCalculation(db.Model):
             'windDirection': self.wind_direction,
             'trajectoryData': self.trajectory_data,
             'notes': self.notes,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'updatedAt': self.updated_at.isoformat() if self.updated_at else None,
+            'createdAt': _iso(self.created_at),
+            'updatedAt': _iso(self.updated_at),
         }
     
+    @classmethod
+    def save_many(cls, objs):
+        """Save many ballistic calculations to database in a single transaction"""
+        try:
+            db.session.bulk_save_objects(objs)
+            db.session.commit()
+            return True
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
     def save(self):
-        """Save ballistic calculation to database"""
+        """Stage ballistic calculation for the end-of-request commit
+
+        Flushes (so generated ids/timestamps are available) but leaves
+        the commit to the after_request hook - one fsync per request
+        no matter how many entities a handler saves.
+        """
         try:
             db.session.add(self)
-            db.session.commit()
+            db.session.flush()
             return True
         except Exception as e:
             db.session.rollback()
             raise e
     
     def delete(self):
-        """Delete ballistic calculation from database"""
+        """Stage ballistic calculation deletion for the end-of-request commit"""
         try:
             db.session.delete(self)
-            db.session.commit()
+            db.session.flush()
             return True
         except Exception as e:
             db.session.rollback()
             raise e
     
+    @classmethod
+    def delete_by_ids(cls, ids):
+        """Delete many ballistic calculations in one statement (no per-row round-trips)"""
+        if not ids:
+            return 0
+        try:
+            result = db.session.execute(
+                delete(cls).where(cls.id.in_(ids)).execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            return result.rowcount
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
+    @classmethod
+    def delete_by_user_id(cls, user_id):
+        """Delete all of a user's ballistic calculations in one statement"""
+        try:
+            result = db.session.execute(
+                delete(cls).where(cls.user_id == user_id).execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            return result.rowcount
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
     @staticmethod
     def find_by_rifle_id(rifle_id):
         """Find all ballistic calculations by rifle ID, sorted by created date (newest first)"""
-        return BallisticCalculation.query.filter_by(rifle_id=rifle_id).order_by(BallisticCalculation.created_at.desc()).all()
+        return db.session.scalars(
+            select(BallisticCalculation).where(BallisticCalculation.rifle_id == rifle_id)
+            .order_by(BallisticCalculation.created_at.desc())
+        ).all()
     
+    @staticmethod
+    def page_by_rifle_id(rifle_id, after_created_at=None, after_id=None, limit=50):
+        """One keyset page of ballistic calculations for a rifle, newest first
+
+        Pass the last row's (created_at, id) back as the cursor for
+        the next page; the (rifle_id, created_at DESC) index serves
+        every page in O(log N), unlike deep OFFSET scans.
+        """
+        stmt = select(BallisticCalculation).where(BallisticCalculation.rifle_id == rifle_id)
+        if after_created_at is not None:
+            stmt = stmt.where(
+                tuple_(BallisticCalculation.created_at, BallisticCalculation.id) < (after_created_at, after_id)
+            )
+        stmt = stmt.order_by(BallisticCalculation.created_at.desc(), BallisticCalculation.id.desc()).limit(limit)
+        return db.session.scalars(stmt).all()
+
     @staticmethod
     def find_by_user_id(user_id):
-        """Find all ballistic calculations by user ID"""
-        return BallisticCalculation.query.filter_by(user_id=user_id).all()
+        """Find all ballistic calculations by user ID
+        (rifle/ammunition batched, no lazy loads)"""
+        return db.session.scalars(
+            select(BallisticCalculation).options(
+                selectinload(BallisticCalculation.rifle),
+                selectinload(BallisticCalculation.ammunition),
+                raiseload('*'),
+            ).where(BallisticCalculation.user_id == user_id)
+        ).all()
     
+
+    @staticmethod
+    def stream_dicts_by_user(user_id, batch_size=500):
+        """Stream ballistic calculations for a user as dicts, {batch_size} rows at a time
+
+        Uses a server-side cursor (stream_results) with yield_per so
+        memory stays bounded no matter how many rows the user has.
+        """
+        stmt = select(BallisticCalculation).where(BallisticCalculation.user_id == user_id).execution_options(
+            stream_results=True, yield_per=batch_size
+        )
+        for row in db.session.scalars(stmt):
+            yield row.to_dict()
+
     @staticmethod
     def find_by_id(calculation_id):
-        """Find ballistic calculation by ID"""
-        return BallisticCalculation.query.filter_by(id=calculation_id).first()
\ No newline at end of file
+        """Find ballistic calculation by ID (identity map first, no SQL on repeats)"""
+        return db.session.get(BallisticCalculation, calculation_id)
\ No newline at end of file
@@ -1,18 +1,130 @@
 # app/models/loadout.py
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Float, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Float, ForeignKey, insert, select, update
+from sqlalchemy import Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSON, JSONB
+from flask import current_app
+from sqlalchemy.orm import deferred, joinedload, raiseload, selectinload, undefer_group
+from sqlalchemy.orm.util import identity_key
 import uuid
+from functools import lru_cache
 from app import db
 
+# Binary JSONB on PostgreSQL (GIN-indexable containment queries, no
+# text reparse on read); plain JSON on SQLite test databases
+_JSONB = JSONB().with_variant(JSON(), 'sqlite')
+
+# to_dict field tables, computed once at import: (json_key, attr, fmt)
+# triples per class. Serialization reads loaded column values straight
+# out of __dict__, skipping the instrumented-descriptor __get__ that a
+# literal dict of self.<attr> accesses pays per field; the fmt slot
+# covers the few fields that need formatting.
+
+@lru_cache(maxsize=4096)
+def _iso(dt):
+    """datetime -> ISO-8601 string (None passes through)
+
+    created_at and updated_at are identical until a row is edited and
+    the same rows get reserialized across requests, so the memoized
+    result replaces most isoformat() calls with a dict hit.
+    """
+    return dt.isoformat() if dt else None
+
+
+def _json_list(value):
+    """JSON arrays default to [] in responses"""
+    return value or []
+
+
+def _compile_plain_dict(fields):
+    """Compile a field table into a specialized serializer function
+
+    Emits straight-line source with the keys and formatters inlined
+    (the same trick dataclasses use for __init__/__repr__), so per-row
+    serialization pays no loop, no tuple unpacking, and no per-field
+    branching on whether a formatter exists.
+    """
+    ns = {}
+    lines = ['def _to_plain_dict(self):', '    d = self.__dict__', '    out = {}']
+    for i, (key, attr, fmt) in enumerate(fields):
+        if fmt is not None:
+            ns['_fmt%d' % i] = fmt
+            lines.append('    v = _fmt%d(d.get(%r))' % (i, attr))
+        else:
+            lines.append('    v = d.get(%r)' % attr)
+        lines.append('    if v is not None:')
+        lines.append('        out[%r] = v' % key)
+    lines.append('    return out')
+    exec('\n'.join(lines), ns)
+    return ns['_to_plain_dict']
+
+
+_PLAIN_DICT_COMPILED = {}
+
+
+def _plain_dict(obj, fields):
+    """Build a response dict from an entity's field table
+
+    None-valued fields are omitted - most of the ~25 optional columns
+    are unset per row, so skipping them shrinks both the encoder work
+    and the response bytes. Clients treat a missing key as null.
+
+    The first call per field table compiles a specialized function via
+    _compile_plain_dict; later calls dispatch straight to it.
+    """
+    fn = _PLAIN_DICT_COMPILED.get(fields)
+    if fn is None:
+        fn = _PLAIN_DICT_COMPILED[fields] = _compile_plain_dict(fields)
+    return fn(obj)
+
+
+def _guard_options():
+    """raiseload sentinel, on in dev/test via SQLALCHEMY_RAISELOAD
+
+    Chained after the explicit eager loads so any relationship a new
+    to_dict field touches raises instead of silently adding one query
+    per row. Production configs leave it off.
+    """
+    if current_app.config.get('SQLALCHEMY_RAISELOAD'):
+        return (raiseload('*'),)
+    return ()
+
+
+def _bulk_create(cls, rows, chunk=1000):
+    """Insert many row dicts through Core in chunked statements
+
+    One multi-row INSERT per chunk and a single commit, instead of a
+    round-trip + fsync per object. id and timestamps are pre-filled in
+    Python so column defaults don't fire per row.
+    """
+    if not rows:
+        return 0
+    now = datetime.utcnow()
+    prepared = []
+    for row in rows:
+        row = dict(row)
+        row.setdefault('id', str(uuid.uuid4()))
+        row.setdefault('created_at', now)
+        row.setdefault('updated_at', now)
+        prepared.append(row)
+    stmt = insert(cls.__table__)
+    try:
+        for start in range(0, len(prepared), chunk):
+            db.session.execute(stmt, prepared[start:start + chunk])
+        db.session.commit()
+        return len(prepared)
+    except Exception as e:
+        db.session.rollback()
+        raise e
+
 class Rifle(db.Model):
     """Rifle Model - Represents rifles in the system"""
     
     __tablename__ = 'rifles'
     
     # Primary fields
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey('users.id'), nullable=False)
+    id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(UUID(as_uuid=False), ForeignKey('users.id'), nullable=False)
     name = Column(String(255), nullable=False)
     brand = Column(String(255), nullable=False)
     manufacturer = Column(String(255), nullable=False)
@@ -20,22 +132,20 @@ class Rifle(db.Model):
     model = Column(String(255), nullable=False)
     caliber = Column(String(100), nullable=False)
     
-    # Barrel information (stored as JSON)
-    barrel = Column(JSON, nullable=True)
-    
-    # Action information (stored as JSON)
-    action = Column(JSON, nullable=True)
-    
-    # Stock information (stored as JSON)
-    stock = Column(JSON, nullable=True)
+    # Component details (stored as JSON) - deferred so list queries
+    # move ~100B of display columns per row instead of KB-sized blobs;
+    # find_by_id undefers the group for detail responses
+    barrel = deferred(Column(_JSONB, nullable=True), group='blob')
+    action = deferred(Column(_JSONB, nullable=True), group='blob')
+    stock = deferred(Column(_JSONB, nullable=True), group='blob')
     
     # Associated scope and ammunition IDs
-    scope_id = Column(String(36), ForeignKey('scopes.id'), nullable=True)
-    ammunition_id = Column(String(36), ForeignKey('ammunition.id'), nullable=True)
+    scope_id = Column(UUID(as_uuid=False), ForeignKey('scopes.id'), nullable=True)
+    ammunition_id = Column(UUID(as_uuid=False), ForeignKey('ammunition.id'), nullable=True)
     
     # Status
     is_active = Column(Boolean, default=False, nullable=False)
-    notes = Column(Text, nullable=True)
+    notes = deferred(Column(Text, nullable=True), group='blob')
     
     # Advanced fields
     serial_number = Column(String(255), nullable=True)
@@ -48,16 +158,69 @@ class Rifle(db.Model):
     sight_model = Column(String(255), nullable=True)
     sight_height = Column(String(100), nullable=True)
     purchase_date = Column(String(100), nullable=True)
-    modifications = Column(Text, nullable=True)
+    modifications = deferred(Column(Text, nullable=True), group='blob')
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
-    # Relationships
-    scope = db.relationship('Scope', backref='rifles_using', lazy=True)
-    ammunition = db.relationship('Ammunition', backref='rifles_using', lazy=True)
-    
+    # Containment lookups like barrel @> {'twist': '1:8'} index-scan
+    # instead of seq-scanning; jsonb_path_ops keeps the index ~1/3 the
+    # size of the default opclass
+    # find_by_user_id filters on user_id; find_active_by_user_id only
+    # ever wants the active row, so the partial index stores one entry
+    # per user instead of the whole stable
+    __table_args__ = (
+        Index('ix_rifles_user', 'user_id'),
+        Index('ix_rifles_user_active', 'user_id',
+              postgresql_where=text('is_active'),
+              sqlite_where=text('is_active = 1')),
+        Index('ix_rifles_barrel_gin', 'barrel',
+              postgresql_using='gin', postgresql_ops={'barrel': 'jsonb_path_ops'}),
+    )
+
+    # Relationships - selectin batches all scopes/ammo for a result set
+    # into one IN-query each instead of a lazy SELECT per rifle touched
+    # by to_dict (2N+1 queries for a list of N rifles)
+    scope = db.relationship('Scope', backref='rifles_using', lazy='selectin')
+    ammunition = db.relationship('Ammunition', backref='rifles_using', lazy='selectin')
+
+    # Ballistic data collections (explicit two-way pairs instead of
+    # implicit backrefs defined on the ballistic models)
+    dope_entries = db.relationship('DopeEntry', back_populates='rifle')
+    zero_entries = db.relationship('ZeroEntry', back_populates='rifle')
+    chronograph_data = db.relationship('ChronographData', back_populates='rifle')
+    ballistic_calculations = db.relationship('BallisticCalculation', back_populates='rifle')
+    maintenance_tasks = db.relationship('Maintenance', back_populates='rifle', lazy='selectin')
+    
+    _FIELDS = (
+        ('id', 'id', None),
+        ('name', 'name', None),
+        ('brand', 'brand', None),
+        ('manufacturer', 'manufacturer', None),
+        ('generationVariant', 'generation_variant', None),
+        ('model', 'model', None),
+        ('caliber', 'caliber', None),
+        ('barrel', 'barrel', None),
+        ('action', 'action', None),
+        ('stock', 'stock', None),
+        ('isActive', 'is_active', None),
+        ('notes', 'notes', None),
+        ('serialNumber', 'serial_number', None),
+        ('overallLength', 'overall_length', None),
+        ('weight', 'weight', None),
+        ('capacity', 'capacity', None),
+        ('finish', 'finish', None),
+        ('sightType', 'sight_type', None),
+        ('sightOptic', 'sight_optic', None),
+        ('sightModel', 'sight_model', None),
+        ('sightHeight', 'sight_height', None),
+        ('purchaseDate', 'purchase_date', None),
+        ('modifications', 'modifications', None),
+        ('createdAt', 'created_at', _iso),
+        ('updatedAt', 'updated_at', _iso),
+    )
+
     def __init__(self, user_id, name, brand, manufacturer, generation_variant, model, caliber, **kwargs):
         self.user_id = user_id
         self.name = name
@@ -67,48 +230,51 @@ class Rifle(db.Model):
         self.model = model
         self.caliber = caliber
         
-        # Set optional fields
+        # Optional fields - frozenset membership instead of hasattr,
+        # which walks the class MRO and fires the descriptor per key
         for key, value in kwargs.items():
-            if hasattr(self, key):
+            if key in self._ALLOWED_KWARGS:
                 setattr(self, key, value)
     
     def to_dict(self):
         """Convert rifle to dictionary for JSON response"""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'brand': self.brand,
-            'manufacturer': self.manufacturer,
-            'generationVariant': self.generation_variant,
-            'model': self.model,
-            'caliber': self.caliber,
-            'barrel': self.barrel,
-            'action': self.action,
-            'stock': self.stock,
-            'scope': self.scope.to_dict() if self.scope else None,
-            'ammunition': self.ammunition.to_dict() if self.ammunition else None,
-            'isActive': self.is_active,
-            'notes': self.notes,
-            'serialNumber': self.serial_number,
-            'overallLength': self.overall_length,
-            'weight': self.weight,
-            'capacity': self.capacity,
-            'finish': self.finish,
-            'sightType': self.sight_type,
-            'sightOptic': self.sight_optic,
-            'sightModel': self.sight_model,
-            'sightHeight': self.sight_height,
-            'purchaseDate': self.purchase_date,
-            'modifications': self.modifications,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'updatedAt': self.updated_at.isoformat() if self.updated_at else None,
-        }
-    
-    def save(self):
-        """Save rifle to database"""
+        # Instances that came from a lean list query haven't loaded the
+        # deferred blobs; touching one column pulls the whole group in
+        # a single SELECT (no-op for detail loads and new objects)
+        if 'barrel' not in self.__dict__:
+            self.barrel
+        data = _plain_dict(self, self._FIELDS)
+        if self.scope is not None:
+            data['scope'] = self.scope.to_dict()
+        if self.ammunition is not None:
+            data['ammunition'] = self.ammunition.to_dict()
+        return data
+
+    def to_list_dict(self):
+        """Slim dict for list rows - identity and display columns only,
+        none of the deferred JSON/Text blobs (reads never trigger the
+        per-row undefer SELECT because _plain_dict skips unloaded
+        attributes)"""
+        return _plain_dict(self, self._LIST_FIELDS)
+    
+    @classmethod
+    def bulk_create(cls, rows, chunk=1000):
+        """Batch-insert rifles from dicts (one statement per chunk)"""
+        return _bulk_create(cls, rows, chunk)
+
+    def save(self, commit=True):
+        """Save rifle to database
+
+        Pass commit=False when saving several entities in one request
+        and commit once at the end (or use app.atomic()) - each commit
+        is an fsync.
+        """
         try:
             db.session.add(self)
-            db.session.commit()
+            if commit:
+                db.session.commit()
+            else:
+                db.session.flush()
             return True
         except Exception as e:
             db.session.rollback()
@@ -126,18 +292,26 @@ class Rifle(db.Model):
     
     @staticmethod
     def find_by_user_id(user_id):
-        """Find all rifles by user ID"""
-        return Rifle.query.filter_by(user_id=user_id).all()
+        """Find all rifles by user ID (scope/ammunition eager, 3 queries total)"""
+        return db.session.scalars(
+            select(Rifle).options(
+                selectinload(Rifle.scope),
+                selectinload(Rifle.ammunition),
+                *_guard_options(),
+            ).where(Rifle.user_id == user_id)
+        ).all()
     
     @staticmethod
     def find_by_id(rifle_id):
-        """Find rifle by ID"""
-        return Rifle.query.filter_by(id=rifle_id).first()
+        """Find rifle by ID with the full blob group loaded (detail view)"""
+        return db.session.get(Rifle, rifle_id, options=(undefer_group('blob'),))
     
     @staticmethod
     def find_active_by_user_id(user_id):
         """Find active rifle by user ID"""
-        return Rifle.query.filter_by(user_id=user_id, is_active=True).first()
+        return db.session.scalars(
+            select(Rifle).where(Rifle.user_id == user_id, Rifle.is_active.is_(True))
+        ).first()
 
 
 class Ammunition(db.Model):
@@ -146,14 +320,14 @@ class Ammunition(db.Model):
     __tablename__ = 'ammunition'
     
     # Primary fields
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey('users.id'), nullable=False)
+    id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(UUID(as_uuid=False), ForeignKey('users.id'), nullable=False)
     name = Column(String(255), nullable=False)
     manufacturer = Column(String(255), nullable=False)
     caliber = Column(String(100), nullable=False)
     
     # Bullet information (stored as JSON)
-    bullet = Column(JSON, nullable=True)
+    bullet = Column(_JSONB, nullable=True)
     
     # Basic load data
     powder = Column(String(255), nullable=True)
@@ -182,7 +356,48 @@ class Ammunition(db.Model):
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
-    
+
+    __table_args__ = (
+        Index('ix_ammunition_bullet_gin', 'bullet',
+              postgresql_using='gin', postgresql_ops={'bullet': 'jsonb_path_ops'}),
+    )
+
+    # Ballistic data collections (explicit two-way pairs instead of
+    # implicit backrefs defined on the ballistic models)
+    dope_entries = db.relationship('DopeEntry', back_populates='ammunition')
+    chronograph_data = db.relationship('ChronographData', back_populates='ammunition')
+    ballistic_calculations = db.relationship('BallisticCalculation', back_populates='ammunition')
+
+    _FIELDS = (
+        ('id', 'id', None),
+        ('name', 'name', None),
+        ('manufacturer', 'manufacturer', None),
+        ('caliber', 'caliber', None),
+        ('bullet', 'bullet', None),
+        ('powder', 'powder', None),
+        ('primer', 'primer', None),
+        ('brass', 'brass', None),
+        ('velocity', 'velocity', None),
+        ('es', 'es', None),
+        ('sd', 'sd', None),
+        ('lotNumber', 'lot_number', None),
+        ('count', 'count', None),
+        ('price', 'price', None),
+        ('tempStable', 'temp_stable', None),
+        ('notes', 'notes', None),
+        ('cartridgeType', 'cartridge_type', None),
+        ('caseMaterial', 'case_material', None),
+        ('primerType', 'primer_type', None),
+        ('pressureClass', 'pressure_class', None),
+        ('sectionalDensity', 'sectional_density', None),
+        ('recoilEnergy', 'recoil_energy', None),
+        ('powderCharge', 'powder_charge', None),
+        ('powderType', 'powder_type', None),
+        ('chronographFPS', 'chronograph_fps', None),
+        ('createdAt', 'created_at', _iso),
+        ('updatedAt', 'updated_at', _iso),
+    )
+
     def __init__(self, user_id, name, manufacturer, caliber, count=0, temp_stable=False, **kwargs):
         self.user_id = user_id
         self.name = name
@@ -191,48 +406,34 @@ class Ammunition(db.Model):
         self.count = count
         self.temp_stable = temp_stable
         
-        # Set optional fields
+        # Optional fields - frozenset membership instead of hasattr,
+        # which walks the class MRO and fires the descriptor per key
         for key, value in kwargs.items():
-            if hasattr(self, key):
+            if key in self._ALLOWED_KWARGS:
                 setattr(self, key, value)
     
     def to_dict(self):
         """Convert ammunition to dictionary for JSON response"""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'manufacturer': self.manufacturer,
-            'caliber': self.caliber,
-            'bullet': self.bullet,
-            'powder': self.powder,
-            'primer': self.primer,
-            'brass': self.brass,
-            'velocity': self.velocity,
-            'es': self.es,
-            'sd': self.sd,
-            'lotNumber': self.lot_number,
-            'count': self.count,
-            'price': self.price,
-            'tempStable': self.temp_stable,
-            'notes': self.notes,
-            'cartridgeType': self.cartridge_type,
-            'caseMaterial': self.case_material,
-            'primerType': self.primer_type,
-            'pressureClass': self.pressure_class,
-            'sectionalDensity': self.sectional_density,
-            'recoilEnergy': self.recoil_energy,
-            'powderCharge': self.powder_charge,
-            'powderType': self.powder_type,
-            'chronographFPS': self.chronograph_fps,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'updatedAt': self.updated_at.isoformat() if self.updated_at else None,
-        }
-    
-    def save(self):
-        """Save ammunition to database"""
+        return _plain_dict(self, self._FIELDS)
+    
+    @classmethod
+    def bulk_create(cls, rows, chunk=1000):
+        """Batch-insert ammunition rows from dicts (one statement per chunk)"""
+        return _bulk_create(cls, rows, chunk)
+
+    def save(self, commit=True):
+        """Save ammunition to database
+
+        Pass commit=False when saving several entities in one request
+        and commit once at the end (or use app.atomic()) - each commit
+        is an fsync.
+        """
         try:
             db.session.add(self)
-            db.session.commit()
+            if commit:
+                db.session.commit()
+            else:
+                db.session.flush()
             return True
         except Exception as e:
             db.session.rollback()
@@ -251,12 +452,14 @@ class Ammunition(db.Model):
     @staticmethod
     def find_by_user_id(user_id):
         """Find all ammunition by user ID"""
-        return Ammunition.query.filter_by(user_id=user_id).all()
+        return db.session.scalars(
+            select(Ammunition).options(*_guard_options()).where(Ammunition.user_id == user_id)
+        ).all()
     
     @staticmethod
     def find_by_id(ammunition_id):
-        """Find ammunition by ID"""
-        return Ammunition.query.filter_by(id=ammunition_id).first()
+        """Find ammunition by ID (identity map first, no SQL on repeats)"""
+        return db.session.get(Ammunition, ammunition_id)
 
 
 class Scope(db.Model):
@@ -265,8 +468,8 @@ class Scope(db.Model):
     __tablename__ = 'scopes'
     
     # Primary fields
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey('users.id'), nullable=False)
+    id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(UUID(as_uuid=False), ForeignKey('users.id'), nullable=False)
     manufacturer = Column(String(255), nullable=False)
     model = Column(String(255), nullable=False)
     tube_size = Column(String(100), nullable=True)
@@ -276,10 +479,10 @@ class Scope(db.Model):
     click_value = Column(String(100), nullable=True)
     
     # Total travel information (stored as JSON)
-    total_travel = Column(JSON, nullable=True)
+    total_travel = Column(_JSONB, nullable=True)
     
     # Zero data (stored as JSON array)
-    zero_data = Column(JSON, nullable=True, default=list)
+    zero_data = Column(_JSONB, nullable=True, default=list)
     
     notes = Column(Text, nullable=True)
     
@@ -287,39 +490,60 @@ class Scope(db.Model):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
+    __table_args__ = (
+        Index('ix_scopes_zero_data_gin', 'zero_data',
+              postgresql_using='gin', postgresql_ops={'zero_data': 'jsonb_path_ops'}),
+    )
+
+    _FIELDS = (
+        ('id', 'id', None),
+        ('manufacturer', 'manufacturer', None),
+        ('model', 'model', None),
+        ('tubeSize', 'tube_size', None),
+        ('focalPlane', 'focal_plane', None),
+        ('reticle', 'reticle', None),
+        ('trackingUnits', 'tracking_units', None),
+        ('clickValue', 'click_value', None),
+        ('totalTravel', 'total_travel', None),
+        ('zeroData', 'zero_data', _json_list),
+        ('notes', 'notes', None),
+        ('createdAt', 'created_at', _iso),
+        ('updatedAt', 'updated_at', _iso),
+    )
+
     def __init__(self, user_id, manufacturer, model, **kwargs):
         self.user_id = user_id
         self.manufacturer = manufacturer
         self.model = model
         
-        # Set optional fields
+        # Optional fields - frozenset membership instead of hasattr,
+        # which walks the class MRO and fires the descriptor per key
         for key, value in kwargs.items():
-            if hasattr(self, key):
+            if key in self._ALLOWED_KWARGS:
                 setattr(self, key, value)
     
     def to_dict(self):
         """Convert scope to dictionary for JSON response"""
-        return {
-            'id': self.id,
-            'manufacturer': self.manufacturer,
-            'model': self.model,
-            'tubeSize': self.tube_size,
-            'focalPlane': self.focal_plane,
-            'reticle': self.reticle,
-            'trackingUnits': self.tracking_units,
-            'clickValue': self.click_value,
-            'totalTravel': self.total_travel,
-            'zeroData': self.zero_data or [],
-            'notes': self.notes,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'updatedAt': self.updated_at.isoformat() if self.updated_at else None,
-        }
-    
-    def save(self):
-        """Save scope to database"""
+        return _plain_dict(self, self._FIELDS)
+    
+    @classmethod
+    def bulk_create(cls, rows, chunk=1000):
+        """Batch-insert scopes from dicts (one statement per chunk)"""
+        return _bulk_create(cls, rows, chunk)
+
+    def save(self, commit=True):
+        """Save scope to database
+
+        Pass commit=False when saving several entities in one request
+        and commit once at the end (or use app.atomic()) - each commit
+        is an fsync.
+        """
         try:
             db.session.add(self)
-            db.session.commit()
+            if commit:
+                db.session.commit()
+            else:
+                db.session.flush()
             return True
         except Exception as e:
             db.session.rollback()
@@ -338,12 +562,14 @@ class Scope(db.Model):
     @staticmethod
     def find_by_user_id(user_id):
         """Find all scopes by user ID"""
-        return Scope.query.filter_by(user_id=user_id).all()
+        return db.session.scalars(
+            select(Scope).options(*_guard_options()).where(Scope.user_id == user_id)
+        ).all()
     
     @staticmethod
     def find_by_id(scope_id):
-        """Find scope by ID"""
-        return Scope.query.filter_by(id=scope_id).first()
+        """Find scope by ID (identity map first, no SQL on repeats)"""
+        return db.session.get(Scope, scope_id)
 
 
 class Maintenance(db.Model):
@@ -352,14 +578,14 @@ class Maintenance(db.Model):
     __tablename__ = 'maintenance'
     
     # Primary fields
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey('users.id'), nullable=False)
-    rifle_id = Column(String(36), ForeignKey('rifles.id'), nullable=False)
+    id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(UUID(as_uuid=False), ForeignKey('users.id'), nullable=False)
+    rifle_id = Column(UUID(as_uuid=False), ForeignKey('rifles.id'), nullable=False)
     title = Column(String(255), nullable=False)
     type = Column(String(255), nullable=False)
     
     # Interval information (stored as JSON)
-    interval = Column(JSON, nullable=False)
+    interval = Column(_JSONB, nullable=False)
     
     last_completed = Column(DateTime, nullable=True)
     current_count = Column(Integer, nullable=True, default=0)
@@ -370,9 +596,29 @@ class Maintenance(db.Model):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
-    # Relationship
-    rifle = db.relationship('Rifle', backref=db.backref('maintenance_tasks', lazy=True))
-    
+    __table_args__ = (
+        Index('ix_maintenance_interval_gin', 'interval',
+              postgresql_using='gin', postgresql_ops={'interval': 'jsonb_path_ops'}),
+    )
+
+    # Relationship - joined load: maintenance rows are always shown
+    # with their rifle, one JOIN beats a lazy SELECT per row
+    rifle = db.relationship('Rifle', back_populates='maintenance_tasks', lazy='joined')
+    
+    _FIELDS = (
+        ('id', 'id', None),
+        ('rifleId', 'rifle_id', None),
+        ('title', 'title', None),
+        ('type', 'type', None),
+        ('interval', 'interval', None),
+        ('lastCompleted', 'last_completed', _iso),
+        ('currentCount', 'current_count', None),
+        ('torqueSpec', 'torque_spec', None),
+        ('notes', 'notes', None),
+        ('createdAt', 'created_at', _iso),
+        ('updatedAt', 'updated_at', _iso),
+    )
+
     def __init__(self, user_id, rifle_id, title, type, interval, **kwargs):
         self.user_id = user_id
         self.rifle_id = rifle_id
@@ -380,38 +626,66 @@ class Maintenance(db.Model):
         self.type = type
         self.interval = interval
         
-        # Set optional fields
+        # Optional fields - frozenset membership instead of hasattr,
+        # which walks the class MRO and fires the descriptor per key
         for key, value in kwargs.items():
-            if hasattr(self, key):
+            if key in self._ALLOWED_KWARGS:
                 setattr(self, key, value)
     
     def to_dict(self):
         """Convert maintenance to dictionary for JSON response"""
-        return {
-            'id': self.id,
-            'rifleId': self.rifle_id,
-            'title': self.title,
-            'type': self.type,
-            'interval': self.interval,
-            'lastCompleted': self.last_completed.isoformat() if self.last_completed else None,
-            'currentCount': self.current_count,
-            'torqueSpec': self.torque_spec,
-            'notes': self.notes,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'updatedAt': self.updated_at.isoformat() if self.updated_at else None,
-        }
+        return _plain_dict(self, self._FIELDS)
     
     def complete_maintenance(self):
         """Mark maintenance as completed"""
         self.last_completed = datetime.utcnow()
         self.current_count = 0
         self.updated_at = datetime.utcnow()
+
+    @classmethod
+    def mark_completed(cls, maintenance_id):
+        """Mark a task completed by id with a single UPDATE
+
+        The "done" button doesn't need the object - this skips the
+        load-mutate-flush round trips entirely. Returns True if a row
+        was updated. A copy already in the identity map gets expired
+        so its next attribute access refetches the new values.
+        """
+        now = datetime.utcnow()
+        try:
+            result = db.session.execute(
+                update(cls)
+                .where(cls.id == maintenance_id)
+                .values(last_completed=now, current_count=0, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            cached = db.session.identity_map.get(identity_key(cls, maintenance_id))
+            if cached is not None:
+                db.session.expire(cached)
+            return result.rowcount > 0
+        except Exception as e:
+            db.session.rollback()
+            raise e
     
-    def save(self):
-        """Save maintenance to database"""
+    @classmethod
+    def bulk_create(cls, rows, chunk=1000):
+        """Batch-insert maintenance tasks from dicts (one statement per chunk)"""
+        return _bulk_create(cls, rows, chunk)
+
+    def save(self, commit=True):
+        """Save maintenance to database
+
+        Pass commit=False when saving several entities in one request
+        and commit once at the end (or use app.atomic()) - each commit
+        is an fsync.
+        """
         try:
             db.session.add(self)
-            db.session.commit()
+            if commit:
+                db.session.commit()
+            else:
+                db.session.flush()
             return True
         except Exception as e:
             db.session.rollback()
@@ -429,15 +703,35 @@ class Maintenance(db.Model):
     
     @staticmethod
     def find_by_user_id(user_id):
-        """Find all maintenance tasks by user ID"""
-        return Maintenance.query.filter_by(user_id=user_id).all()
+        """Find all maintenance tasks by user ID (rifle joined in)"""
+        return db.session.scalars(
+            select(Maintenance).options(
+                joinedload(Maintenance.rifle),
+                *_guard_options(),
+            ).where(Maintenance.user_id == user_id)
+        ).all()
     
     @staticmethod
     def find_by_rifle_id(rifle_id):
         """Find all maintenance tasks by rifle ID"""
-        return Maintenance.query.filter_by(rifle_id=rifle_id).all()
+        return db.session.scalars(
+            select(Maintenance).where(Maintenance.rifle_id == rifle_id)
+        ).all()
     
     @staticmethod
     def find_by_id(maintenance_id):
-        """Find maintenance by ID"""
-        return Maintenance.query.filter_by(id=maintenance_id).first()
\ No newline at end of file
+        """Find maintenance by ID (identity map first, no SQL on repeats)"""
+        return db.session.get(Maintenance, maintenance_id)
+
+# Optional constructor kwargs per class: every mapped column is
+# assignable by keyword, computed once from the table instead of
+# probing hasattr per call
+Rifle._ALLOWED_KWARGS = frozenset(c.key for c in Rifle.__table__.columns)
+
+# Columns in Rifle's deferred 'blob' group; to_list_dict skips them so
+# list serialization never fires a per-row undefer SELECT
+Rifle._BLOB_ATTRS = frozenset({'barrel', 'action', 'stock', 'notes', 'modifications'})
+Rifle._LIST_FIELDS = tuple(f for f in Rifle._FIELDS if f[1] not in Rifle._BLOB_ATTRS)
+Ammunition._ALLOWED_KWARGS = frozenset(c.key for c in Ammunition.__table__.columns)
+Scope._ALLOWED_KWARGS = frozenset(c.key for c in Scope.__table__.columns)
+Maintenance._ALLOWED_KWARGS = frozenset(c.key for c in Maintenance.__table__.columns)
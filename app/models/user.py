@@ -1,17 +1,23 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text
+from sqlalchemy import CheckConstraint, Column, Enum, Index, Integer, String, DateTime, Boolean, Text, select, text
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import load_only
 import uuid
+from flask import current_app
 from werkzeug.security import generate_password_hash, check_password_hash
 from app import db
 
+def _iso(dt):
+    """datetime -> ISO-8601 string (None passes through)"""
+    return dt.isoformat() if dt else None
+
 class User(db.Model):
     """User Model - Represents users in the system"""
     
     __tablename__ = 'users'
     
     # Primary fields
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
     full_name = Column(String(255), nullable=False)
     email = Column(String(255), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=True)  # Nullable for Google OAuth users
@@ -23,13 +29,39 @@ class User(db.Model):
     
     # Profile fields
     photo_url = Column(Text, nullable=True)
-    sign_in_method = Column(String(50), nullable=False, default='email')  # 'email' or 'google'
+    # Closed value set - native 4-byte enum on Postgres instead of a
+    # varchar compare per filter; a CHECK-constrained varchar on SQLite
+    sign_in_method = Column(Enum('email', 'google', name='sign_in_method',
+                                 create_constraint=True, validate_strings=True),
+                            nullable=False, default='email')
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     last_sign_in = Column(DateTime, nullable=True)
+
+    # The constructor lowercases email, but the constraint makes the
+    # invariant hold for every writer (bulk imports, manual fixes), so
+    # find_by_email's equality probe always hits the unique index - no
+    # lower(email) wrapping needed at query time
+    __table_args__ = (
+        CheckConstraint('email = lower(email)', name='ck_users_email_lower'),
+    )
     
+    # to_dict field table, computed once: (json_key, attr, fmt). The
+    # serializer reads loaded values from __dict__ instead of paying
+    # the instrumented-descriptor access per field.
+    _FIELDS = (
+        ('id', 'id', None),
+        ('fullName', 'full_name', None),
+        ('email', 'email', None),
+        ('emailVerified', 'email_verified', None),
+        ('photoURL', 'photo_url', None),
+        ('signInMethod', 'sign_in_method', None),
+        ('createdAt', 'created_at', _iso),
+        ('lastSignIn', 'last_sign_in', _iso),
+    )
+
     def __init__(self, full_name, email, password=None, google_id=None, photo_url=None, sign_in_method='email'):
         self.full_name = full_name
         self.email = email.lower().strip()
@@ -44,10 +76,35 @@ class User(db.Model):
         if sign_in_method == 'google':
             self.email_verified = True
     
+    # Fallback when no app context is around (scripts, shells)
+    _HASH_METHOD_DEFAULT = 'scrypt:32768:8:1'
+
+    @classmethod
+    def _hash_method(cls):
+        """Configured werkzeug method string for new password hashes"""
+        try:
+            return current_app.config.get('PASSWORD_HASH_METHOD', cls._HASH_METHOD_DEFAULT)
+        except RuntimeError:
+            return cls._HASH_METHOD_DEFAULT
+
     def set_password(self, password):
-        """Hash and set password"""
+        """Hash and set password
+
+        scrypt runs in OpenSSL's C implementation - werkzeug's pbkdf2
+        default loops HMAC-SHA256 in Python and dominates signup/login
+        CPU. Cost parameters come from PASSWORD_HASH_METHOD so
+        operators can tune per hardware; check_password_hash reads the
+        method from the stored hash, so hashes under old parameters
+        keep verifying.
+        """
         if password:
-            self.password_hash = generate_password_hash(password)
+            self.password_hash = generate_password_hash(
+                password, method=self._hash_method(), salt_length=16)
+
+    def password_needs_rehash(self):
+        """True if the stored hash predates the configured parameters"""
+        return bool(self.password_hash) and \
+            not self.password_hash.startswith(self._hash_method() + '$')
     
     def check_password(self, password):
         """Check if provided password matches hash"""
@@ -62,39 +119,67 @@ class User(db.Model):
     
     def to_dict(self):
         """Convert user to dictionary for JSON response"""
+        data = self.__dict__
         return {
-            'id': self.id,
-            'fullName': self.full_name,
-            'email': self.email,
-            'emailVerified': self.email_verified,
-            'photoURL': self.photo_url,
-            'signInMethod': self.sign_in_method,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
-            'lastSignIn': self.last_sign_in.isoformat() if self.last_sign_in else None
+            key: fmt(data.get(attr)) if fmt else data.get(attr)
+            for key, attr, fmt in self._FIELDS
         }
     
     def to_flutter_dict(self):
-        """Convert user to dictionary matching Flutter UserModel"""
-        return {
-            'id': self.id,
-            'fullName': self.full_name,
-            'email': self.email
+        """Convert user to dictionary matching Flutter UserModel
+
+        Memoized per instance: auth flows serialize the same user
+        more than once in a request (auth_success now, user_response
+        later), so repeats reuse the built dict. The source fields
+        ride along as the cache key, which invalidates the entry if
+        any of them change between calls.
+        """
+        key = (self.id, self.full_name, self.email)
+        cached = self.__dict__.get('_flutter_cache')
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        data = {
+            'id': key[0],
+            'fullName': key[1],
+            'email': key[2]
         }
+        self._flutter_cache = (key, data)
+        return data
     
     @staticmethod
     def find_by_email(email):
         """Find user by email"""
-        return User.query.filter_by(email=email.lower().strip()).first()
+        return db.session.scalars(
+            select(User).where(User.email == email.lower().strip())
+        ).first()
     
+    @staticmethod
+    def find_by_email_for_auth(email):
+        """Find user by email, loading only the auth columns
+
+        For flows that check credentials/state but never serialize the
+        user back (e.g. forgot_password): id, name, hash and
+        active-flag come over the wire, not the whole row. Callers
+        that return the user in a response need find_by_email.
+        """
+        return db.session.scalars(
+            select(User).options(
+                load_only(User.id, User.full_name, User.is_active,
+                          User.password_hash)
+            ).where(User.email == email.lower().strip())
+        ).first()
+
     @staticmethod
     def find_by_google_id(google_id):
         """Find user by Google ID"""
-        return User.query.filter_by(google_id=google_id).first()
+        return db.session.scalars(
+            select(User).where(User.google_id == google_id)
+        ).first()
     
     @staticmethod
     def find_by_id(user_id):
-        """Find user by ID"""
-        return User.query.filter_by(id=user_id).first()
+        """Find user by ID (identity map first, no SQL on repeats)"""
+        return db.session.get(User, user_id)
     
     def save(self):
         """Save user to database"""
@@ -126,12 +211,26 @@ class PasswordResetToken(db.Model):
     __tablename__ = 'password_reset_tokens'
     
     id = Column(Integer, primary_key=True)
-    user_id = Column(String(36), db.ForeignKey('users.id'), nullable=False)
+    user_id = Column(UUID(as_uuid=False), db.ForeignKey('users.id'), nullable=False)
     token = Column(String(255), unique=True, nullable=False, index=True)
     expires_at = Column(DateTime, nullable=False)
     used = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
+    # Lookups only ever want unused tokens; the partial indexes stay
+    # tiny because consumed tokens drop out of them. The (user_id,
+    # token) index serves the joined OTP/reset lookups, and the
+    # expires_at index carries the bulk cleanup DELETEs.
+    __table_args__ = (
+        Index('ix_reset_tokens_token_unused', 'token',
+              postgresql_where=text('used = false'),
+              sqlite_where=text('used = 0')),
+        Index('ix_reset_tokens_user_token_unused', 'user_id', 'token',
+              postgresql_where=text('used = false'),
+              sqlite_where=text('used = 0')),
+        Index('ix_reset_tokens_expires', 'expires_at'),
+    )
+
     # Relationship
     user = db.relationship('User', backref=db.backref('reset_tokens', lazy=True))
     
@@ -144,24 +243,38 @@ class PasswordResetToken(db.Model):
         """Check if token is valid (not used and not expired)"""
         return not self.used and self.expires_at > datetime.utcnow()
     
-    def mark_as_used(self):
-        """Mark token as used"""
+    def mark_as_used(self, commit=True):
+        """Mark token as used
+
+        Pass commit=False inside a wider transaction (atomic()) so the
+        flip rides the caller's single commit.
+        """
         self.used = True
-        db.session.commit()
+        if commit:
+            db.session.commit()
     
     @staticmethod
     def find_valid_token(token):
-        """Find valid token"""
-        reset_token = PasswordResetToken.query.filter_by(token=token).first()
-        if reset_token and reset_token.is_valid():
-            return reset_token
-        return None
+        """Find valid token - used/expiry checks run in SQL, so invalid
+        tokens never come back over the wire"""
+        return db.session.scalars(
+            select(PasswordResetToken).where(
+                PasswordResetToken.token == token,
+                PasswordResetToken.used.is_(False),
+                PasswordResetToken.expires_at > datetime.utcnow(),
+            )
+        ).first()
     
-    def save(self):
-        """Save token to database"""
+    def save(self, commit=True):
+        """Save token to database
+
+        commit=False adds the row to the session without flushing the
+        transaction - for callers batching writes under atomic().
+        """
         try:
             db.session.add(self)
-            db.session.commit()
+            if commit:
+                db.session.commit()
             return True
         except Exception as e:
             db.session.rollback()
@@ -1,17 +1,17 @@
+from concurrent.futures import ThreadPoolExecutor
+from string import Template
 from flask import current_app
 from flask_mail import Message
 from app import mail
 import logging
 
-class EmailService:
-    """Email service for sending notifications"""
-    
-    def send_password_reset_otp(self, email, user_name, otp):
-        """Send password reset OTP email"""
-        try:
-            subject = "RifleAxis - Password Reset Code"
-            
-            html_body = f"""
+logger = logging.getLogger(__name__)
+
+# Email bodies, built once at import. The static multi-KB markup used
+# to be re-parsed and re-assembled as an f-string on every send;
+# string.Template substitutes the two dynamic values into the
+# preassembled text instead.
+_RESET_HTML = Template("""
             <!DOCTYPE html>
             <html>
             <head>
@@ -19,80 +19,80 @@ class EmailService:
                 <meta name="viewport" content="width=device-width, initial-scale=1.0">
                 <title>Password Reset - RifleAxis</title>
                 <style>
-                    body {{
+                    body {
                         font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
                         background-color: #f5f5f5;
                         margin: 0;
                         padding: 20px;
-                    }}
-                    .container {{
+                    }
+                    .container {
                         max-width: 600px;
                         margin: 0 auto;
                         background-color: white;
                         border-radius: 12px;
                         box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
                         overflow: hidden;
-                    }}
-                    .header {{
+                    }
+                    .header {
                         background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
                         color: white;
                         padding: 30px 20px;
                         text-align: center;
-                    }}
-                    .header h1 {{
+                    }
+                    .header h1 {
                         margin: 0;
                         font-size: 28px;
                         font-weight: 600;
-                    }}
-                    .content {{
+                    }
+                    .content {
                         padding: 40px 30px;
-                    }}
-                    .greeting {{
+                    }
+                    .greeting {
                         font-size: 18px;
                         margin-bottom: 20px;
                         color: #333;
-                    }}
-                    .otp-container {{
+                    }
+                    .otp-container {
                         background-color: #f8f9ff;
                         border: 2px solid #667eea;
                         border-radius: 8px;
                         padding: 20px;
                         text-align: center;
                         margin: 30px 0;
-                    }}
-                    .otp-code {{
+                    }
+                    .otp-code {
                         font-size: 32px;
                         font-weight: bold;
                         color: #667eea;
                         letter-spacing: 8px;
                         margin: 10px 0;
-                    }}
-                    .otp-text {{
+                    }
+                    .otp-text {
                         color: #666;
                         font-size: 14px;
                         margin-top: 10px;
-                    }}
-                    .instructions {{
+                    }
+                    .instructions {
                         background-color: #fff3cd;
                         border: 1px solid #ffeaa7;
                         border-radius: 6px;
                         padding: 15px;
                         margin: 20px 0;
                         color: #856404;
-                    }}
-                    .footer {{
+                    }
+                    .footer {
                         background-color: #f8f9fa;
                         padding: 20px;
                         text-align: center;
                         color: #666;
                         font-size: 14px;
                         border-top: 1px solid #e9ecef;
-                    }}
-                    .warning {{
+                    }
+                    .warning {
                         color: #dc3545;
                         font-size: 14px;
                         margin-top: 20px;
-                    }}
+                    }
                 </style>
             </head>
             <body>
@@ -104,13 +104,13 @@ class EmailService:
                     
                     <div class="content">
                         <div class="greeting">
-                            Hello {user_name},
+                            Hello $user_name,
                         </div>
                         
                         <p>You have requested to reset your password for your RifleAxis account. Use the verification code below to proceed:</p>
                         
                         <div class="otp-container">
-                            <div class="otp-code">{otp}</div>
+                            <div class="otp-code">$otp</div>
                             <div class="otp-text">Enter this 4-digit code in the app</div>
                         </div>
                         
@@ -137,45 +137,25 @@ class EmailService:
                 </div>
             </body>
             </html>
-            """
-            
-            text_body = f"""
+            """)
+
+_RESET_TEXT = Template("""
             RifleAxis - Password Reset Code
             
-            Hello {user_name},
+            Hello $user_name,
             
             You have requested to reset your password for your RifleAxis account.
             
-            Your verification code is: {otp}
+            Your verification code is: $otp
             
             This code will expire in 10 minutes.
             
             If you didn't request this password reset, please ignore this email.
             
             © 2025 RifleAxis. All rights reserved.
-            """
-            
-            msg = Message(
-                subject=subject,
-                recipients=[email],
-                html=html_body,
-                body=text_body,
-                sender=current_app.config['MAIL_DEFAULT_SENDER']
-            )
-            
-            mail.send(msg)
-            return True
-            
-        except Exception as e:
-            logging.error(f"Failed to send password reset email: {str(e)}")
-            return False
-    
-    def send_welcome_email(self, email, user_name):
-        """Send welcome email to new users"""
-        try:
-            subject = "Welcome to RifleAxis! 🎯"
-            
-            html_body = f"""
+            """)
+
+_WELCOME_HTML = Template("""
             <!DOCTYPE html>
             <html>
             <head>
@@ -183,64 +163,64 @@ class EmailService:
                 <meta name="viewport" content="width=device-width, initial-scale=1.0">
                 <title>Welcome to RifleAxis</title>
                 <style>
-                    body {{
+                    body {
                         font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
                         background-color: #f5f5f5;
                         margin: 0;
                         padding: 20px;
-                    }}
-                    .container {{
+                    }
+                    .container {
                         max-width: 600px;
                         margin: 0 auto;
                         background-color: white;
                         border-radius: 12px;
                         box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
                         overflow: hidden;
-                    }}
-                    .header {{
+                    }
+                    .header {
                         background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
                         color: white;
                         padding: 40px 20px;
                         text-align: center;
-                    }}
-                    .header h1 {{
+                    }
+                    .header h1 {
                         margin: 0;
                         font-size: 32px;
                         font-weight: 600;
-                    }}
-                    .content {{
+                    }
+                    .content {
                         padding: 40px 30px;
-                    }}
-                    .greeting {{
+                    }
+                    .greeting {
                         font-size: 20px;
                         margin-bottom: 20px;
                         color: #333;
-                    }}
-                    .features {{
+                    }
+                    .features {
                         background-color: #f8f9ff;
                         border-radius: 8px;
                         padding: 20px;
                         margin: 20px 0;
-                    }}
-                    .feature {{
+                    }
+                    .feature {
                         margin: 15px 0;
                         padding: 10px 0;
                         border-bottom: 1px solid #eee;
-                    }}
-                    .feature:last-child {{
+                    }
+                    .feature:last-child {
                         border-bottom: none;
-                    }}
-                    .feature h3 {{
+                    }
+                    .feature h3 {
                         margin: 0 0 5px 0;
                         color: #667eea;
-                    }}
-                    .footer {{
+                    }
+                    .footer {
                         background-color: #f8f9fa;
                         padding: 20px;
                         text-align: center;
                         color: #666;
                         font-size: 14px;
-                    }}
+                    }
                 </style>
             </head>
             <body>
@@ -252,7 +232,7 @@ class EmailService:
                     
                     <div class="content">
                         <div class="greeting">
-                            Welcome aboard, {user_name}!
+                            Welcome aboard, $user_name!
                         </div>
                         
                         <p>Thank you for joining RifleAxis, the ultimate platform for precision shooting enthusiasts. We're excited to help you improve your shooting accuracy and track your progress.</p>
@@ -291,12 +271,12 @@ class EmailService:
                 </div>
             </body>
             </html>
-            """
-            
-            text_body = f"""
+            """)
+
+_WELCOME_TEXT = Template("""
             Welcome to RifleAxis! 🎯
             
-            Hello {user_name},
+            Hello $user_name,
             
             Thank you for joining RifleAxis, the ultimate platform for precision shooting enthusiasts.
             
@@ -310,19 +290,78 @@ class EmailService:
             
             Happy shooting! 🎯
             © 2025 RifleAxis. All rights reserved.
-            """
+            """)
+
+# Bounded background pool for SMTP work. A handshake + TLS + send takes
+# 200-1500ms; dispatching from a worker thread frees the request worker
+# as soon as the DB write is committed, and the cap keeps a burst of
+# sends from overwhelming the SMTP server.
+_MAIL_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='mail')
+
+class EmailService:
+    """Email service for sending notifications"""
+
+    @staticmethod
+    def _submit(app, fn, *args):
+        """Run a send method on the pool inside an app context"""
+        def _task():
+            with app.app_context():
+                fn(*args)
+        _MAIL_POOL.submit(_task)
+
+    def send_password_reset_otp_async(self, email, user_name, otp):
+        """Queue the OTP email and return immediately
+
+        Failures are logged by the underlying send method instead of
+        surfacing to the caller - the HTTP response has already gone
+        out by the time SMTP finishes.
+        """
+        self._submit(current_app._get_current_object(),
+                     self.send_password_reset_otp, email, user_name, otp)
+
+    def send_welcome_email_async(self, email, user_name):
+        """Queue the welcome email and return immediately"""
+        self._submit(current_app._get_current_object(),
+                     self.send_welcome_email, email, user_name)
+    
+    def send_password_reset_otp(self, email, user_name, otp):
+        """Send password reset OTP email"""
+        try:
+            subject = "RifleAxis - Password Reset Code"
+            
+            
+            msg = Message(
+                subject=subject,
+                recipients=[email],
+                html=_RESET_HTML.substitute(user_name=user_name, otp=otp),
+                body=_RESET_TEXT.substitute(user_name=user_name, otp=otp),
+                sender=current_app.config['MAIL_DEFAULT_SENDER']
+            )
+            
+            mail.send(msg)
+            return True
+            
+        except Exception:
+            logger.exception("Failed to send password reset email")
+            return False
+    
+    def send_welcome_email(self, email, user_name):
+        """Send welcome email to new users"""
+        try:
+            subject = "Welcome to RifleAxis! 🎯"
+            
             
             msg = Message(
                 subject=subject,
                 recipients=[email],
-                html=html_body,
-                body=text_body,
+                html=_WELCOME_HTML.substitute(user_name=user_name),
+                body=_WELCOME_TEXT.substitute(user_name=user_name),
                 sender=current_app.config['MAIL_DEFAULT_SENDER']
             )
             
             mail.send(msg)
             return True
             
-        except Exception as e:
-            logging.error(f"Failed to send welcome email: {str(e)}")
+        except Exception:
+            logger.exception("Failed to send welcome email")
             return False
\ No newline at end of file
@@ -1,10 +1,99 @@
+import hashlib
+import re
+import threading
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import jwt
 from google.auth.transport import requests as google_requests
 from google.oauth2 import id_token
 from flask import current_app
 import logging
 
+# Lazy %-style args defer formatting until a handler actually wants
+# the record, so disabled debug logging costs one level check - no
+# f-string allocation, no stdout write+flush per sign-in.
+logger = logging.getLogger(__name__)
+
+# One HTTPS session for every Google endpoint - certs, token exchange,
+# userinfo, revoke - so repeat calls reuse the TLS connection instead
+# of paying a fresh handshake each time. The adapter sizes the
+# keep-alive pool for concurrent sign-ins (default is 10 total) and
+# retries transient connect/read failures with a short backoff.
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=2, backoff_factor=0.1,
+                      status_forcelist=(502, 503, 504),
+                      allowed_methods=None),
+))
+
+# Google's JWKS rotates rarely (their Cache-Control says hours). The
+# keys are parsed into RSA public key objects once per fetch and the
+# {kid: key} map is cached until max-age expires, so fallback
+# verifications pay neither the HTTPS round-trip nor the JWK->RSA
+# materialization - just a dict lookup.
+_JWKS_URL = 'https://www.googleapis.com/oauth2/v3/certs'
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+_jwks_cache = {'keys': None, 'expires': 0.0}
+_jwks_lock = threading.Lock()
+
+# Verified id_tokens, keyed by digest and capped by the token's own
+# exp claim - a replay within its lifetime skips signature checking.
+_TOKEN_CACHE_MAX = 1000
+_token_cache = {}
+_token_lock = threading.Lock()
+
+
+def _get_google_jwks():
+    """Google's signing keys as {kid: RSAPublicKey}, refreshed per
+    their Cache-Control max-age"""
+    now = time.time()
+    with _jwks_lock:
+        if _jwks_cache['keys'] is not None and _jwks_cache['expires'] > now:
+            return _jwks_cache['keys']
+    response = _HTTP_SESSION.get(_JWKS_URL)
+    response.raise_for_status()
+    keys = {
+        k['kid']: jwt.algorithms.RSAAlgorithm.from_jwk(k)
+        for k in response.json().get('keys', [])
+        if 'kid' in k
+    }
+    match = _MAX_AGE_RE.search(response.headers.get('Cache-Control', ''))
+    ttl = int(match.group(1)) if match else 3600
+    with _jwks_lock:
+        _jwks_cache['keys'] = keys
+        _jwks_cache['expires'] = now + ttl
+    return keys
+
+
+def _cached_user_info(token):
+    """User info for an already-verified, still-live token, else None"""
+    key = hashlib.sha256(token.encode()).digest()
+    with _token_lock:
+        entry = _token_cache.get(key)
+        if entry is not None and entry[0] > time.time():
+            return entry[1]
+        return None
+
+
+def _remember_token(token, exp, user_info):
+    """Cache a verified token until its exp claim"""
+    key = hashlib.sha256(token.encode()).digest()
+    now = time.time()
+    with _token_lock:
+        if len(_token_cache) >= _TOKEN_CACHE_MAX:
+            stale = [k for k, (e, _) in _token_cache.items() if e <= now]
+            for k in stale:
+                del _token_cache[k]
+            while len(_token_cache) >= _TOKEN_CACHE_MAX:
+                _token_cache.pop(next(iter(_token_cache)))
+        _token_cache[key] = (exp, user_info)
+
+
 class GoogleOAuthService:
     """Google OAuth service for handling Google Sign-In with debugging"""
     
@@ -18,11 +107,13 @@ class GoogleOAuthService:
             self.client_id = current_app.config.get('GOOGLE_CLIENT_ID')
             self.client_secret = current_app.config.get('GOOGLE_CLIENT_SECRET')
         
-        print(f"🔵 Google Client ID: {self.client_id}")
-        print(f"🔵 Google Client Secret: {'***' if self.client_secret else 'Not set'}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Google Client ID: %s", self.client_id)
+            logger.debug("Google Client Secret: %s",
+                         '***' if self.client_secret else 'Not set')
         
         if not self.client_id or not self.client_secret:
-            print("❌ Google OAuth configuration not found in environment variables")
+            logger.error("Google OAuth configuration not found in environment variables")
             return False
         return True
     
@@ -37,36 +128,41 @@ class GoogleOAuthService:
             tuple: (is_valid: bool, user_info: dict or None)
         """
         try:
-            print(f"🔵 Verifying Google token: {token[:50]}...")
-            
             if not self._get_google_config():
                 return False, None
             
+            # Replayed token still inside its exp window - already
+            # verified once, skip the signature work and network
+            cached = _cached_user_info(token)
+            if cached is not None:
+                logger.debug("Token served from verification cache")
+                return True, cached
+            
             # Method 1: Try with google.oauth2.id_token (recommended)
             try:
-                print("🔵 Attempting verification with google.oauth2.id_token...")
+                logger.debug("Attempting verification with google.oauth2.id_token...")
                 idinfo = id_token.verify_oauth2_token(
                     token, 
-                    google_requests.Request(), 
+                    google_requests.Request(session=_HTTP_SESSION), 
                     self.client_id
                 )
-                print("✅ Token verified successfully with google.oauth2.id_token")
+                logger.debug("Token verified successfully with google.oauth2.id_token")
                 
             except Exception as e:
-                print(f"❌ Method 1 failed: {str(e)}")
+                logger.debug("Library verification failed (%s), falling back to manual", e)
                 
                 # Method 2: Try manual verification with PyJWT (fallback)
-                print("🔵 Attempting manual verification...")
                 return self._verify_token_manually(token)
             
             # Check if token is from correct issuer
             if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
-                print(f"❌ Wrong issuer: {idinfo.get('iss')}")
+                logger.warning("Wrong issuer: %s", idinfo.get('iss'))
                 return False, None
             
             # Check audience (client ID)
             if idinfo.get('aud') != self.client_id:
-                print(f"❌ Wrong audience. Expected: {self.client_id}, Got: {idinfo.get('aud')}")
+                logger.warning("Wrong audience. Expected: %s, Got: %s",
+                               self.client_id, idinfo.get('aud'))
                 return False, None
             
             # Token is valid, return user info
@@ -80,49 +176,53 @@ class GoogleOAuthService:
                 'email_verified': idinfo.get('email_verified', False)
             }
             
-            print(f"✅ User info extracted: {user_info['email']}")
+            logger.debug("User info extracted: %s", user_info['email'])
+            _remember_token(token, idinfo.get('exp', time.time() + 300), user_info)
             return True, user_info
             
         except ValueError as e:
-            print(f"❌ ValueError during token verification: {str(e)}")
+            logger.warning("ValueError during token verification: %s", e)
             return False, None
-        except Exception as e:
-            print(f"❌ Unexpected error during Google token verification: {str(e)}")
+        except Exception:
+            logger.exception("Unexpected error during Google token verification")
             return False, None
     
     def _verify_token_manually(self, token):
         """Manual token verification as fallback"""
         try:
-            print("🔵 Attempting manual token verification...")
+            logger.debug("Attempting manual token verification...")
             
-            # Decode without verification first to see the structure
-            unverified = jwt.decode(token, options={"verify_signature": False})
-            print(f"🔵 Token payload (unverified): {unverified}")
-            
-            # Get Google's public keys
-            keys_response = requests.get('https://www.googleapis.com/oauth2/v3/certs')
-            keys = keys_response.json()
+            # Get Google's public keys (parsed + cached per max-age)
+            keys = _get_google_jwks()
             
             # Verify token manually
             header = jwt.get_unverified_header(token)
             key_id = header.get('kid')
             
-            if key_id not in keys:
-                print(f"❌ Key ID {key_id} not found in Google keys")
+            public_key = keys.get(key_id)
+            if public_key is None:
+                logger.warning("Key ID %s not found in Google keys", key_id)
                 return False, None
             
-            public_key = jwt.algorithms.RSAAlgorithm.from_jwk(keys[key_id])
-            
-            # Verify the token
+            # One verifying decode does all the work: the claim
+            # requirements ride along with signature verification, so
+            # the token's base64+JSON payload is only decoded once.
+            # (PyJWT's issuer= kwarg only compares against a single
+            # string on this version, so the two accepted issuers are
+            # checked by hand below.)
             payload = jwt.decode(
                 token,
                 public_key,
                 algorithms=['RS256'],
                 audience=self.client_id,
-                issuer=['accounts.google.com', 'https://accounts.google.com']
+                options={"require": ["exp", "iat", "aud", "iss", "sub"]}
             )
             
-            print("✅ Token verified manually")
+            if payload['iss'] not in ('accounts.google.com', 'https://accounts.google.com'):
+                logger.warning("Wrong issuer: %s", payload['iss'])
+                return False, None
+            
+            logger.debug("Token verified manually")
             
             user_info = {
                 'sub': payload['sub'],
@@ -134,10 +234,12 @@ class GoogleOAuthService:
                 'email_verified': payload.get('email_verified', False)
             }
             
+            _remember_token(token, payload.get('exp', time.time() + 300), user_info)
             return True, user_info
             
         except Exception as e:
-            print(f"❌ Manual verification failed: {str(e)}")
+            # Bad tokens are routine here - log without a stack trace
+            logger.warning("Manual verification failed: %s", e)
             return False, None
     
     def exchange_code_for_token(self, authorization_code, redirect_uri):
@@ -165,7 +267,7 @@ class GoogleOAuthService:
                 'redirect_uri': redirect_uri
             }
             
-            response = requests.post(token_url, data=data)
+            response = _HTTP_SESSION.post(token_url, data=data)
             response.raise_for_status()
             
             token_data = response.json()
@@ -186,10 +288,10 @@ class GoogleOAuthService:
                 return False, "No ID token in response"
                 
         except requests.RequestException as e:
-            print(f"❌ Error exchanging authorization code: {str(e)}")
+            logger.warning("Error exchanging authorization code: %s", e)
             return False, f"Token exchange failed: {str(e)}"
         except Exception as e:
-            print(f"❌ Unexpected error during token exchange: {str(e)}")
+            logger.exception("Unexpected error during token exchange")
             return False, f"Unexpected error: {str(e)}"
     
     def get_user_info(self, access_token):
@@ -206,17 +308,17 @@ class GoogleOAuthService:
             user_info_url = "https://www.googleapis.com/oauth2/v2/userinfo"
             headers = {'Authorization': f'Bearer {access_token}'}
             
-            response = requests.get(user_info_url, headers=headers)
+            response = _HTTP_SESSION.get(user_info_url, headers=headers)
             response.raise_for_status()
             
             user_info = response.json()
             return True, user_info
             
         except requests.RequestException as e:
-            print(f"❌ Error getting user info: {str(e)}")
+            logger.warning("Error getting user info: %s", e)
             return False, f"Failed to get user info: {str(e)}"
         except Exception as e:
-            print(f"❌ Unexpected error getting user info: {str(e)}")
+            logger.exception("Unexpected error getting user info")
             return False, f"Unexpected error: {str(e)}"
     
     def revoke_token(self, token):
@@ -231,9 +333,9 @@ class GoogleOAuthService:
         """
         try:
             revoke_url = f"https://oauth2.googleapis.com/revoke?token={token}"
-            response = requests.post(revoke_url)
+            response = _HTTP_SESSION.post(revoke_url)
             return response.status_code == 200
             
-        except Exception as e:
-            print(f"❌ Error revoking token: {str(e)}")
+        except Exception:
+            logger.exception("Error revoking token")
             return False
\ No newline at end of file
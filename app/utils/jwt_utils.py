@@ -2,32 +2,55 @@ from flask_jwt_extended import create_access_token, create_refresh_token, get_jw
 from datetime import timedelta
 from flask import current_app
 
+# Constant portion of the access-token claims; per-call construction
+# only has to add the user_id on top of a copy
+_ACCESS_CLAIMS_TEMPLATE = {"type": "access"}
+
 class JWTUtils:
     """JWT utility functions"""
     
+    # Expiry config resolved once: every token issuance was paying
+    # several current_app proxy dereferences, config dict lookups and
+    # a timedelta.total_seconds() for values fixed at startup
+    _access_exp = None
+    _refresh_exp = None
+    _access_exp_seconds = None
+    
+    @classmethod
+    def _expiry(cls):
+        """(access timedelta, refresh timedelta, access seconds), cached"""
+        if cls._access_exp is None:
+            cls._access_exp = current_app.config['JWT_ACCESS_TOKEN_EXPIRES']
+            cls._refresh_exp = current_app.config['JWT_REFRESH_TOKEN_EXPIRES']
+            cls._access_exp_seconds = int(cls._access_exp.total_seconds())
+        return cls._access_exp, cls._refresh_exp, cls._access_exp_seconds
+    
     @staticmethod
-    def generate_tokens(user_id):
-        """Generate access and refresh tokens for user"""
-        additional_claims = {
-            "user_id": user_id,
-            "type": "access"
-        }
-        
-        access_token = create_access_token(
+    def _mint_access_token(user_id, access_exp):
+        """Access token with the standard claims for user_id"""
+        additional_claims = _ACCESS_CLAIMS_TEMPLATE.copy()
+        additional_claims["user_id"] = user_id
+        return create_access_token(
             identity=user_id,
-            expires_delta=current_app.config['JWT_ACCESS_TOKEN_EXPIRES'],
+            expires_delta=access_exp,
             additional_claims=additional_claims
         )
+    
+    @staticmethod
+    def generate_tokens(user_id):
+        """Generate access and refresh tokens for user"""
+        access_exp, refresh_exp, access_seconds = JWTUtils._expiry()
+        access_token = JWTUtils._mint_access_token(user_id, access_exp)
         
         refresh_token = create_refresh_token(
             identity=user_id,
-            expires_delta=current_app.config['JWT_REFRESH_TOKEN_EXPIRES']
+            expires_delta=refresh_exp
         )
         
         return {
             'access_token': access_token,
             'refresh_token': refresh_token,
-            'expires_in': int(current_app.config['JWT_ACCESS_TOKEN_EXPIRES'].total_seconds())
+            'expires_in': access_seconds
         }
     
     @staticmethod
@@ -38,18 +61,10 @@ class JWTUtils:
     @staticmethod
     def refresh_access_token(user_id):
         """Generate new access token using refresh token"""
-        additional_claims = {
-            "user_id": user_id,
-            "type": "access"
-        }
-        
-        new_token = create_access_token(
-            identity=user_id,
-            expires_delta=current_app.config['JWT_ACCESS_TOKEN_EXPIRES'],
-            additional_claims=additional_claims
-        )
+        access_exp, _, access_seconds = JWTUtils._expiry()
+        new_token = JWTUtils._mint_access_token(user_id, access_exp)
         
         return {
             'access_token': new_token,
-            'expires_in': int(current_app.config['JWT_ACCESS_TOKEN_EXPIRES'].total_seconds())
+            'expires_in': access_seconds
         }
\ No newline at end of file
@@ -1,18 +1,44 @@
 import re
 from email_validator import validate_email, EmailNotValidError
 
+# Pattern compiled once at import - sanitization runs on every auth
+# request, so per-call re.* literal lookups add up
+_SANITIZE_RE = re.compile(r'[<>"\']')
+
+# Accepted special characters for password strength
+_PASSWORD_SPECIALS = frozenset('!@#$%^&*(),.?":{}|<>')
+
+# Fast path for the common ASCII email shape. Deliberately stricter
+# than the library (no leading/trailing/doubled dots, ASCII only) so
+# anything it accepts the library would accept too; everything else
+# falls through to email_validator for the full answer.
+_EMAIL_FAST_RE = re.compile(
+    r"^[A-Za-z0-9_%+-]+(?:\.[A-Za-z0-9_%+-]+)*"
+    r"@(?:[A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?\.)+[A-Za-z]{2,}$")
+
 class Validators:
     """Validation utility functions"""
-    
+
     @staticmethod
     def validate_email_format(email):
-        """Validate email format"""
+        """Validate email format
+
+        Syntax-only: the deliverability check would resolve the
+        domain's DNS on every call, adding a network round-trip to
+        each auth request for little signal (typos mostly fail the
+        syntax rules anyway). Plain ASCII addresses - the vast
+        majority - match the compiled pattern and skip the library's
+        parse/IDNA machinery entirely.
+        """
+        if email and len(email) <= 254 and _EMAIL_FAST_RE.match(email) \
+                and len(email.partition('@')[0]) <= 64:
+            return True, None
         try:
-            validate_email(email)
+            validate_email(email, check_deliverability=False)
             return True, None
         except EmailNotValidError as e:
             return False, str(e)
-    
+
     @staticmethod
     def validate_password(password):
         """
@@ -25,59 +51,96 @@ class Validators:
         """
         if not password:
             return False, "Password is required"
-        
+
         if len(password) < 8:
             return False, "Password must be at least 8 characters long"
-        
-        if not re.search(r'[A-Z]', password):
+
+        # One scan sets all three requirement flags instead of a
+        # separate regex pass per requirement; the categories are
+        # disjoint, so elif skips the later tests once one matches
+        has_upper = has_digit = has_special = False
+        for ch in password:
+            if ch.isupper():
+                has_upper = True
+            elif ch.isdigit():
+                has_digit = True
+            elif ch in _PASSWORD_SPECIALS:
+                has_special = True
+
+        if not has_upper:
             return False, "Password must contain at least one uppercase letter"
-        
-        if not re.search(r'[0-9]', password):
+
+        if not has_digit:
             return False, "Password must contain at least one number"
-        
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+
+        if not has_special:
             return False, "Password must contain at least one special character"
-        
+
         return True, None
-    
+
     @staticmethod
     def validate_full_name(full_name):
         """Validate full name"""
-        if not full_name or not full_name.strip():
+        # Strip once - each .strip() call allocates a fresh string
+        stripped = full_name.strip() if full_name else ''
+        if not stripped:
             return False, "Full name is required"
-        
-        if len(full_name.strip()) < 2:
+
+        if len(stripped) < 2:
             return False, "Full name must be at least 2 characters long"
-        
-        if len(full_name.strip()) > 255:
+
+        if len(stripped) > 255:
             return False, "Full name must be less than 255 characters"
-        
+
         return True, None
-    
+
     @staticmethod
     def validate_otp(otp):
         """Validate OTP format"""
         if not otp:
             return False, "OTP is required"
-        
+
         if not otp.isdigit():
             return False, "OTP must contain only numbers"
-        
+
         if len(otp) != 4:
             return False, "OTP must be 4 digits"
-        
+
         return True, None
-    
+
+    @staticmethod
+    def validate_and_sanitize_registration(full_name, email, password):
+        """Fused validation for the registration preamble
+
+        One entry point instead of three validator calls plus a
+        sanitize pass; each input is still scanned once and the error
+        messages match the individual validators exactly. Returns
+        (ok, error, sanitized_full_name).
+        """
+        ok, error = Validators.validate_full_name(full_name)
+        if not ok:
+            return False, error, None
+
+        ok, error = Validators.validate_email_format(email)
+        if not ok:
+            return False, error, None
+
+        ok, error = Validators.validate_password(password)
+        if not ok:
+            return False, error, None
+
+        return True, None, Validators.sanitize_string(full_name)
+
     @staticmethod
     def sanitize_string(text, max_length=255):
         """Sanitize string input"""
         if not text:
             return ""
-        
+
         # Strip whitespace and limit length
         sanitized = text.strip()[:max_length]
-        
+
         # Remove potentially harmful characters
-        sanitized = re.sub(r'[<>"\']', '', sanitized)
-        
-        return sanitized
\ No newline at end of file
+        sanitized = _SANITIZE_RE.sub('', sanitized)
+
+        return sanitized
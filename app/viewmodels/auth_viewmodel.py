@@ -1,7 +1,26 @@
 from app.services.auth_service import AuthService
+from app.utils.jwt_utils import JWTUtils
 from app.utils.responses import ApiResponse
 import logging
 
+logger = logging.getLogger(__name__)
+
+def _get_required(data, key, label, strip=True):
+    """Fetch a required request field -> (value, error_response).
+
+    One lookup and at most one strip per field, instead of the
+    get/strip/truthiness dance each handler repeated inline. Returns
+    the ready validation_error when the field is missing or blank;
+    strip=False preserves fields where whitespace is significant
+    (passwords).
+    """
+    value = data.get(key)
+    if strip and isinstance(value, str):
+        value = value.strip()
+    if not value:
+        return None, ApiResponse.validation_error(f"{label} is required")
+    return value, None
+
 class AuthViewModel:
     """Auth ViewModel - Handles business logic for authentication views"""
     
@@ -10,23 +29,21 @@ class AuthViewModel:
     
     def handle_user_registration(self, request_data):
         """Handle user registration request"""
+        # Extraction and required-field checks raise nothing - no
+        # reason to run them under the exception frame
+        full_name, err = _get_required(request_data, 'fullName', 'Full name')
+        if err:
+            return err
+        
+        email, err = _get_required(request_data, 'email', 'Email')
+        if err:
+            return err
+        
+        password, err = _get_required(request_data, 'password', 'Password', strip=False)
+        if err:
+            return err
+        
         try:
-            # Extract data from request
-            full_name = request_data.get('fullName', '').strip()
-            email = request_data.get('email', '').strip()
-            password = request_data.get('password', '')
-            
-            # Validate required fields
-            if not full_name:
-                return ApiResponse.validation_error("Full name is required")
-            
-            if not email:
-                return ApiResponse.validation_error("Email is required")
-            
-            if not password:
-                return ApiResponse.validation_error("Password is required")
-            
-            # Call service layer
             success, message, user, tokens = self.auth_service.register_user(
                 full_name, email, password
             )
@@ -36,25 +53,21 @@ class AuthViewModel:
             else:
                 return ApiResponse.error(message)
                 
-        except Exception as e:
-            logging.error(f"Registration error in ViewModel: {str(e)}")
+        except Exception:
+            logger.exception("Registration error in ViewModel")
             return ApiResponse.server_error("Registration failed")
     
     def handle_user_login(self, request_data):
         """Handle user login request"""
+        email, err = _get_required(request_data, 'email', 'Email')
+        if err:
+            return err
+        
+        password, err = _get_required(request_data, 'password', 'Password', strip=False)
+        if err:
+            return err
+        
         try:
-            # Extract data from request
-            email = request_data.get('email', '').strip()
-            password = request_data.get('password', '')
-            
-            # Validate required fields
-            if not email:
-                return ApiResponse.validation_error("Email is required")
-            
-            if not password:
-                return ApiResponse.validation_error("Password is required")
-            
-            # Call service layer
             success, message, user, tokens = self.auth_service.login_user(email, password)
             
             if success:
@@ -62,21 +75,17 @@ class AuthViewModel:
             else:
                 return ApiResponse.error(message)
                 
-        except Exception as e:
-            logging.error(f"Login error in ViewModel: {str(e)}")
+        except Exception:
+            logger.exception("Login error in ViewModel")
             return ApiResponse.server_error("Login failed")
     
     def handle_google_signin(self, request_data):
         """Handle Google sign-in request"""
+        google_token, err = _get_required(request_data, 'googleToken', 'Google token', strip=False)
+        if err:
+            return err
+        
         try:
-            # Extract Google token from request
-            google_token = request_data.get('googleToken', '')
-            
-            # Validate required fields
-            if not google_token:
-                return ApiResponse.validation_error("Google token is required")
-            
-            # Call service layer
             success, message, user, tokens = self.auth_service.google_signin(google_token)
             
             if success:
@@ -84,21 +93,17 @@ class AuthViewModel:
             else:
                 return ApiResponse.error(message)
                 
-        except Exception as e:
-            logging.error(f"Google sign-in error in ViewModel: {str(e)}")
+        except Exception:
+            logger.exception("Google sign-in error in ViewModel")
             return ApiResponse.server_error("Google sign-in failed")
     
     def handle_forgot_password(self, request_data):
         """Handle forgot password request"""
+        email, err = _get_required(request_data, 'email', 'Email')
+        if err:
+            return err
+        
         try:
-            # Extract email from request
-            email = request_data.get('email', '').strip()
-            
-            # Validate required fields
-            if not email:
-                return ApiResponse.validation_error("Email is required")
-            
-            # Call service layer
             success, message = self.auth_service.forgot_password(email)
             
             if success:
@@ -106,25 +111,21 @@ class AuthViewModel:
             else:
                 return ApiResponse.error(message)
                 
-        except Exception as e:
-            logging.error(f"Forgot password error in ViewModel: {str(e)}")
+        except Exception:
+            logger.exception("Forgot password error in ViewModel")
             return ApiResponse.server_error("Failed to process password reset request")
     
     def handle_verify_otp(self, request_data):
         """Handle OTP verification request"""
+        email, err = _get_required(request_data, 'email', 'Email')
+        if err:
+            return err
+        
+        otp, err = _get_required(request_data, 'otp', 'OTP')
+        if err:
+            return err
+        
         try:
-            # Extract data from request
-            email = request_data.get('email', '').strip()
-            otp = request_data.get('otp', '').strip()
-            
-            # Validate required fields
-            if not email:
-                return ApiResponse.validation_error("Email is required")
-            
-            if not otp:
-                return ApiResponse.validation_error("OTP is required")
-            
-            # Call service layer
             success, message, reset_token = self.auth_service.verify_otp(email, otp)
             
             if success:
@@ -135,29 +136,25 @@ class AuthViewModel:
             else:
                 return ApiResponse.error(message)
                 
-        except Exception as e:
-            logging.error(f"OTP verification error in ViewModel: {str(e)}")
+        except Exception:
+            logger.exception("OTP verification error in ViewModel")
             return ApiResponse.server_error("OTP verification failed")
     
     def handle_reset_password(self, request_data):
         """Handle password reset request"""
+        email, err = _get_required(request_data, 'email', 'Email')
+        if err:
+            return err
+        
+        reset_token, err = _get_required(request_data, 'resetToken', 'Reset token')
+        if err:
+            return err
+        
+        new_password, err = _get_required(request_data, 'newPassword', 'New password', strip=False)
+        if err:
+            return err
+        
         try:
-            # Extract data from request
-            email = request_data.get('email', '').strip()
-            reset_token = request_data.get('resetToken', '').strip()
-            new_password = request_data.get('newPassword', '')
-            
-            # Validate required fields
-            if not email:
-                return ApiResponse.validation_error("Email is required")
-            
-            if not reset_token:
-                return ApiResponse.validation_error("Reset token is required")
-            
-            if not new_password:
-                return ApiResponse.validation_error("New password is required")
-            
-            # Call service layer
             success, message = self.auth_service.reset_password(email, reset_token, new_password)
             
             if success:
@@ -165,8 +162,8 @@ class AuthViewModel:
             else:
                 return ApiResponse.error(message)
                 
-        except Exception as e:
-            logging.error(f"Password reset error in ViewModel: {str(e)}")
+        except Exception:
+            logger.exception("Password reset error in ViewModel")
             return ApiResponse.server_error("Password reset failed")
     
     def handle_get_current_user(self, user_id):
@@ -180,15 +177,13 @@ class AuthViewModel:
             else:
                 return ApiResponse.error(message)
                 
-        except Exception as e:
-            logging.error(f"Get current user error in ViewModel: {str(e)}")
+        except Exception:
+            logger.exception("Get current user error in ViewModel")
             return ApiResponse.server_error("Failed to get user information")
     
     def handle_refresh_token(self, user_id):
         """Handle token refresh request"""
         try:
-            from app.utils.jwt_utils import JWTUtils
-            
             # Generate new access token
             new_tokens = JWTUtils.refresh_access_token(user_id)
             
@@ -197,6 +192,6 @@ class AuthViewModel:
                 message="Token refreshed successfully"
             )
             
-        except Exception as e:
-            logging.error(f"Token refresh error in ViewModel: {str(e)}")
+        except Exception:
+            logger.exception("Token refresh error in ViewModel")
             return ApiResponse.server_error("Token refresh failed")
\ No newline at end of file
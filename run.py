@@ -1,30 +1,30 @@
 # run.py - Updated with complete RifleAxis API
 import os
-from app import create_app, db, init_database
+from dotenv import load_dotenv
+
+# Load .env once at the entrypoint, before any config is read
+load_dotenv()
+
+from app import create_app, db, init_database, prepare_database
 from sqlalchemy import text
 
 def setup_database():
     """Setup database automatically on startup"""
     app = create_app()
-    
+
     with app.app_context():
         try:
             print("🔧 Setting up database...")
-            
-            # Test database connection first (SQLAlchemy 2.0+ compatible)
-            with db.engine.connect() as connection:
-                connection.execute(text('SELECT 1'))
-            print("✅ Database connection successful")
-            
-            # Create all tables
-            db.create_all()
-            print("✅ Database tables created/verified")
-            
+
+            # Create/verify all tables (connection test included)
+            if not prepare_database(app):
+                return False
+
             # Initialize with basic data if needed
             init_database()
-            
+
             return True
-            
+
         except Exception as e:
             print(f"❌ Database setup failed: {e}")
             print("\n🔍 Troubleshooting tips:")
@@ -416,8 +416,11 @@ def create_user_sample_data(user_id):
             notes='10-shot string from 20" barrel'
         )
         chrono.save()
-        
-       
+
+        # Ballistic save() only flushes (commit happens per request in
+        # the app); outside a request we commit explicitly
+        db.session.commit()
+
         print(f"✅ Sample data created for user {user_id}")
         
     except Exception as e:
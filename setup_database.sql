@@ -0,0 +1,85 @@
+-- RifleAxis operational DDL (PostgreSQL only)
+--
+-- Range-partitions the two append-heavy ballistic tables by created_at
+-- so "recent N per rifle" queries stop touching historic pages and old
+-- quarters can be detached/dropped in O(1). Run manually (psql -f) on
+-- databases that have outgrown the plain tables; the application works
+-- unchanged against either layout.
+--
+-- Notes:
+--  * Postgres requires the partition key inside the primary key, so the
+--    PK widens from (id) to (id, created_at). id stays globally unique
+--    in practice (UUIDs), the composite PK is a partitioning formality.
+--  * Extend the quarterly partitions ahead of time (cron or pg_partman);
+--    rows outside every declared range land in the _default partition.
+
+BEGIN;
+
+-- ---------------------------------------------------------------------
+-- chronograph_data
+-- ---------------------------------------------------------------------
+ALTER TABLE chronograph_data RENAME TO chronograph_data_old;
+
+CREATE TABLE chronograph_data (
+    LIKE chronograph_data_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE chronograph_data_2025_q4 PARTITION OF chronograph_data
+    FOR VALUES FROM ('2025-10-01') TO ('2026-01-01');
+CREATE TABLE chronograph_data_2026_q1 PARTITION OF chronograph_data
+    FOR VALUES FROM ('2026-01-01') TO ('2026-04-01');
+CREATE TABLE chronograph_data_2026_q2 PARTITION OF chronograph_data
+    FOR VALUES FROM ('2026-04-01') TO ('2026-07-01');
+CREATE TABLE chronograph_data_2026_q3 PARTITION OF chronograph_data
+    FOR VALUES FROM ('2026-07-01') TO ('2026-10-01');
+CREATE TABLE chronograph_data_default PARTITION OF chronograph_data DEFAULT;
+
+INSERT INTO chronograph_data SELECT * FROM chronograph_data_old;
+DROP TABLE chronograph_data_old;
+
+-- Partitioned indexes propagate to every child (and future partitions)
+CREATE INDEX ix_chrono_rifle_created ON chronograph_data (rifle_id, created_at DESC);
+CREATE INDEX ix_chrono_user ON chronograph_data (user_id);
+
+-- ---------------------------------------------------------------------
+-- ballistic_calculations
+-- ---------------------------------------------------------------------
+ALTER TABLE ballistic_calculations RENAME TO ballistic_calculations_old;
+
+CREATE TABLE ballistic_calculations (
+    LIKE ballistic_calculations_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE ballistic_calculations_2025_q4 PARTITION OF ballistic_calculations
+    FOR VALUES FROM ('2025-10-01') TO ('2026-01-01');
+CREATE TABLE ballistic_calculations_2026_q1 PARTITION OF ballistic_calculations
+    FOR VALUES FROM ('2026-01-01') TO ('2026-04-01');
+CREATE TABLE ballistic_calculations_2026_q2 PARTITION OF ballistic_calculations
+    FOR VALUES FROM ('2026-04-01') TO ('2026-07-01');
+CREATE TABLE ballistic_calculations_2026_q3 PARTITION OF ballistic_calculations
+    FOR VALUES FROM ('2026-07-01') TO ('2026-10-01');
+CREATE TABLE ballistic_calculations_default PARTITION OF ballistic_calculations DEFAULT;
+
+INSERT INTO ballistic_calculations SELECT * FROM ballistic_calculations_old;
+DROP TABLE ballistic_calculations_old;
+
+CREATE INDEX ix_calc_rifle_created ON ballistic_calculations (rifle_id, created_at DESC);
+CREATE INDEX ix_calc_user ON ballistic_calculations (user_id);
+
+COMMIT;
+
+-- Retiring a quarter:
+--   ALTER TABLE chronograph_data DETACH PARTITION chronograph_data_2025_q4;
+--   DROP TABLE chronograph_data_2025_q4;  -- or archive first
+
+-- ---------------------------------------------------------------------
+-- One-shot backfill for databases created before dope_entries split
+-- elevation/windage into structured value + unit columns
+-- ---------------------------------------------------------------------
+-- UPDATE dope_entries SET
+--     elevation_value = (regexp_match(elevation, '^\s*(-?\d+\.?\d*)'))[1]::numeric,
+--     elevation_unit  = upper(nullif((regexp_match(elevation, '(MOA|MIL)\s*$', 'i'))[1], '')),
+--     windage_value   = (regexp_match(windage, '^\s*(-?\d+\.?\d*)'))[1]::numeric,
+--     windage_unit    = upper(nullif((regexp_match(windage, '(MOA|MIL)\s*$', 'i'))[1], ''));
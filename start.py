@@ -119,18 +119,12 @@ def check_postgresql():
 def create_tables():
     """Create database tables if they don't exist"""
     try:
-        from app import create_app, db
-        from app.models.user import User, PasswordResetToken
-        
+        from app import create_app, prepare_database
+
         app = create_app()
-        with app.app_context():
-            # Create all tables
-            db.create_all()
-            
-            # Test tables
-            User.query.count()
-            PasswordResetToken.query.count()
-            
+        if not prepare_database(app):
+            return False
+
         print("✅ Database tables ready")
         return True
     except Exception as e: